@@ -1,4 +1,6 @@
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+from kombu import Queue
 
 celery_app = Celery(
     "ems6",
@@ -6,6 +8,46 @@ celery_app = Celery(
     backend="redis://redis:6379/1"
 )
 
+# -----------------------------
+# Priority queues
+# -----------------------------
+# Each queue gets its own worker pool, so a big bulk job never delays an
+# interactive check. Run one worker per queue (see docker-compose.yml):
+#   celery -A app.celery_worker worker -Q interactive -c 32 --prefetch-multiplier 4 -n interactive@%h
+#   celery -A app.celery_worker worker -Q multiple -c 8 --prefetch-multiplier 1 -n multiple@%h
+#   celery -A app.celery_worker worker -Q bulk -c 8 --prefetch-multiplier 1 -n bulk@%h
+# Bulk chunks are long: prefetch 1 keeps them from queueing up behind a busy
+# process. Which chunks reach the bulk queue at all is decided per user by
+# app/services/job_scheduler.py.
+celery_app.conf.task_queues = (
+    Queue("interactive"),
+    Queue("multiple"),
+    Queue("bulk"),
+)
+celery_app.conf.task_default_queue = "bulk"
+celery_app.conf.worker_prefetch_multiplier = 1
 celery_app.conf.task_routes = {
-    "app.tasks.email_tasks.*": {"queue": "email_queue"},
+    "app.tasks.email_tasks.validate_single_email": {"queue": "interactive"},
+    "app.tasks.email_tasks.validate_multiple_emails": {"queue": "multiple"},
+    "app.tasks.email_tasks.reprobe_greylisted": {"queue": "multiple"},
+    # Job control is quick bookkeeping; it must not wait behind bulk chunks
+    "app.tasks.email_tasks.resume_job": {"queue": "multiple"},
+    "app.tasks.email_tasks.settle_job": {"queue": "multiple"},
+    "app.tasks.email_tasks.*": {"queue": "bulk"},
 }
+
+
+# -----------------------------
+# Per-process async runtime
+# -----------------------------
+# Imported lazily: the web app imports celery_app as well
+@worker_process_init.connect
+def start_worker_runtime(**kwargs):
+    from app.core.worker_runtime import runtime
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def stop_worker_runtime(**kwargs):
+    from app.core.worker_runtime import runtime
+    runtime.stop()
@@ -6,6 +6,91 @@ class Settings(BaseSettings):
     session_secret: str
     access_token_expire_minutes: int
 
+    # DNS resolver cache (app/core/dns_resolver.py)
+    dns_cache_size: int = 50000
+    dns_cache_min_ttl: int = 30
+    dns_cache_max_ttl: int = 3600
+    dns_negative_ttl: int = 300
+    dns_timeout: float = 3.0
+
+    # SMTP probing (app/logic/smtp_pool.py)
+    smtp_port: int = 25
+    smtp_timeout: float = 5.0
+    smtp_helo_host: str = ""  # defaults to socket.gethostname()
+    smtp_mail_from: str = "test@example.com"
+    smtp_rcpt_per_transaction: int = 20
+    smtp_max_rcpt_per_session: int = 100
+    smtp_idle_timeout: float = 30.0
+    smtp_max_idle_sessions_per_host: int = 4
+
+    # SMTP probe scheduling (app/logic/smtp_scheduler.py)
+    smtp_max_connections_per_host: int = 5
+    smtp_rate_per_host: float = 10.0  # RCPTs per second
+    smtp_max_connections_per_group: int = 20
+    smtp_rate_per_group: float = 40.0
+
+    # Greylisted RCPTs are re-probed later by a Celery task
+    greylist_retry_delay: int = 300  # seconds
+    greylist_max_attempts: int = 3
+
+    # Optional shared cache (e.g. redis://redis:6379/2); empty = in-memory only
+    redis_url: str = ""
+
+    # Per-domain catch-all verdict cache (app/logic/catchall_check.py)
+    catchall_cache_ttl: int = 86400
+    catchall_cache_size: int = 100000
+
+    # WHOIS domain expiry (app/services/domain_expiry.py)
+    whois_server: str = "whois.iana.org"
+    whois_port: int = 43
+    whois_timeout: float = 8.0
+    whois_max_workers: int = 8
+    whois_cache_size: int = 50000
+    whois_negative_ttl: int = 3600
+    whois_refresh_margin: int = 7 * 86400  # re-check this long before expiry
+
+    # Disposable/freemail/blacklist/role lists (app/logic/domain_lists.py)
+    domain_lists_dir: str = ""  # defaults to app/data
+    domain_list_reload_interval: float = 30.0
+
+    # Skip expensive check tiers once the score can't change category
+    validation_score_bound: bool = True
+
+    # Time budget of one interactive validation (app/core/deadline.py)
+    request_deadline: float = 10.0
+
+    # Bulk/batch jobs are split into chunk tasks (app/tasks/email_tasks.py)
+    bulk_chunk_size: int = 500
+    chunk_max_retries: int = 3
+    chunk_stale_after: int = 1800  # s without a checkpoint before a queued chunk counts as lost
+    upload_dir: str = ""  # spooled uploads; must be shared with workers (default: system temp)
+
+    # Fair share of the bulk queue (app/services/job_scheduler.py)
+    bulk_max_inflight_chunks: int = 16  # chunks queued or running, all users
+    bulk_max_chunks_per_user: int = 4
+
+    # Database pools (app/database.py): async engine of the web app
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds; below the server/proxy idle timeout
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # asyncpg prepared statements; 0 behind pgbouncer (transaction mode)
+    sync_db_pool_size: int = 5  # sync engine of the Celery tasks
+    sync_db_max_overflow: int = 5
+
+    # Per-worker-process async runtime (app/core/worker_runtime.py)
+    worker_db_pool_size: int = 5
+    worker_db_max_overflow: int = 5
+    validation_concurrency: int = 50  # validations in flight per list/chunk
+    # job_results rows per INSERT. Each flush is also the chunk's checkpoint,
+    # i.e. its heartbeat against chunk_stale_after: keep it well below bulk_chunk_size
+    job_results_flush_rows: int = 100
+
+    # Buffered email_validations upserts (app/services/result_writer.py)
+    result_flush_rows: int = 500
+    result_flush_ms: int = 200
+
     class Config:
         env_file = ".env"
         extra = "ignore"
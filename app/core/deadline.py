@@ -0,0 +1,45 @@
+# app/core/deadline.py
+import asyncio
+import time
+
+from app.config import settings
+
+
+class Deadline:
+    """
+    Time budget of one request, created at the route and handed down to
+    everything it calls. Work that runs past it is abandoned and reported
+    as unknown (None) instead of holding the request.
+    """
+
+    def __init__(self, budget: float | None = None):
+        budget = settings.request_deadline if budget is None else budget
+        self.expires_at = time.monotonic() + budget
+
+    @classmethod
+    def at(cls, timestamp: float) -> "Deadline":
+        """Rebuild a deadline from a wall-clock timestamp (e.g. in a Celery task)."""
+        return cls(timestamp - time.time())
+
+    def timestamp(self) -> float:
+        """Wall-clock expiry, for passing the deadline to another process."""
+        return time.time() + self.remaining()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def share(self, weight: float, total: float) -> float:
+        """`weight / total` of the time that is left."""
+        return self.remaining() * weight / total if total else self.remaining()
+
+    async def run(self, awaitable, timeout: float | None = None):
+        """Await `awaitable` for at most `timeout` (and never past the deadline); None on timeout."""
+        timeout = self.remaining() if timeout is None else min(timeout, self.remaining())
+        try:
+            return await asyncio.wait_for(awaitable, max(timeout, 0))
+        except asyncio.TimeoutError:
+            return None
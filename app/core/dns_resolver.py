@@ -0,0 +1,163 @@
+# app/core/dns_resolver.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+import aiodns
+import dns.resolver
+import pycares
+
+from app.config import settings
+
+# aiodns error codes that mean "the name/record does not exist" (safe to cache)
+_NEGATIVE_CODES = {aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA}
+
+# query_dns() returns the whole answer section (CNAMEs included): keep these
+_RDTYPES = {"MX": pycares.QUERY_TYPE_MX, "TXT": pycares.QUERY_TYPE_TXT, "A": pycares.QUERY_TYPE_A}
+
+
+class CachedResolver:
+    """
+    Process-wide async DNS resolver with an in-memory answer cache.
+
+    Answers are cached per (name, rdtype) for the record TTL (clamped to
+    the configured min/max), negative answers for `dns_negative_ttl`.
+    The cache is LRU-evicted once it holds `dns_cache_size` entries.
+
+    Answers are normalized so every check sees the same shape:
+      MX  -> [(priority, host), ...] sorted by priority
+      TXT -> ["v=spf1 ...", ...]
+      A   -> ["1.2.3.4", ...]
+    """
+
+    def __init__(self, max_size: int, min_ttl: int, max_ttl: int,
+                 negative_ttl: int, timeout: float):
+        self.max_size = max_size
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self._cache: OrderedDict = OrderedDict()  # (name, rdtype) -> (expires_at, answers)
+        self._lock = threading.Lock()
+        self._resolvers = {}  # event loop -> aiodns.DNSResolver
+
+    # -----------------------------
+    # Cache helpers
+    # -----------------------------
+    def _get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, answers = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return answers
+
+    def _put(self, key, answers: list, ttl: int) -> None:
+        ttl = max(self.min_ttl, min(self.max_ttl, ttl))
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, answers)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _aiodns(self) -> aiodns.DNSResolver:
+        # aiodns resolvers are bound to the loop they were created on
+        # (Celery tasks run several short-lived loops per process).
+        loop = asyncio.get_running_loop()
+        resolver = self._resolvers.get(loop)
+        if resolver is None:
+            for old_loop in [l for l in self._resolvers if l.is_closed()]:
+                del self._resolvers[old_loop]
+            resolver = aiodns.DNSResolver(loop=loop, timeout=self.timeout)
+            self._resolvers[loop] = resolver
+        return resolver
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    async def resolve(self, name: str, rdtype: str) -> list:
+        """
+        Resolve `name` asynchronously, serving from cache when possible.
+        Returns [] for NXDOMAIN / no data; raises on timeouts and server errors.
+        """
+        key = (name.lower().rstrip("."), rdtype.upper())
+        answers = self._get(key)
+        if answers is not None:
+            return answers
+
+        try:
+            result = await self._aiodns().query_dns(key[0], key[1])
+        except aiodns.error.DNSError as e:
+            if e.args and e.args[0] in _NEGATIVE_CODES:
+                self._put(key, [], self.negative_ttl)
+                return []
+            raise
+
+        records = [r for r in result.answer if r.type == _RDTYPES.get(key[1])]
+        if not records:
+            self._put(key, [], self.negative_ttl)
+            return []
+        answers = _normalize_aiodns(key[1], records)
+        self._put(key, answers, min(r.ttl for r in records))
+        return answers
+
+    def resolve_sync(self, name: str, rdtype: str) -> list:
+        """
+        Blocking variant for sync call sites (scrapers, scripts).
+        Shares the same cache as `resolve`.
+        """
+        key = (name.lower().rstrip("."), rdtype.upper())
+        answers = self._get(key)
+        if answers is not None:
+            return answers
+
+        try:
+            response = dns.resolver.resolve(key[0], key[1], lifetime=self.timeout)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            self._put(key, [], self.negative_ttl)
+            return []
+
+        answers = _normalize_dnspython(key[1], response)
+        self._put(key, answers, response.rrset.ttl)
+        return answers
+
+
+def _normalize_aiodns(rdtype: str, records) -> list:
+    if rdtype == "MX":
+        return sorted((r.data.priority, r.data.exchange.rstrip(".")) for r in records)
+    if rdtype == "TXT":
+        return [r.data.data.decode(errors="ignore") if isinstance(r.data.data, bytes) else r.data.data
+                for r in records]
+    return [r.data.addr for r in records]
+
+
+def _normalize_dnspython(rdtype: str, response) -> list:
+    if rdtype == "MX":
+        return sorted((r.preference, str(r.exchange).rstrip(".")) for r in response)
+    if rdtype == "TXT":
+        return [b"".join(r.strings).decode(errors="ignore") for r in response]
+    return [r.to_text() for r in response]
+
+
+async def resolve_mx(domain: str) -> list[str]:
+    """Return MX hosts for a domain, most preferred first."""
+    return [host for _, host in await resolver.resolve(domain, "MX")]
+
+
+# 👇 single resolver (and cache) shared by every check in the process
+resolver = CachedResolver(
+    max_size=settings.dns_cache_size,
+    min_ttl=settings.dns_cache_min_ttl,
+    max_ttl=settings.dns_cache_max_ttl,
+    negative_ttl=settings.dns_negative_ttl,
+    timeout=settings.dns_timeout,
+)
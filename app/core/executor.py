@@ -0,0 +1,36 @@
+# app/core/executor.py
+import asyncio
+
+_DONE = object()
+
+
+async def bounded_map(func, items, limit: int):
+    """
+    Apply the async `func` to every item with at most `limit` calls in
+    flight, yielding (item, result) as each call completes.
+
+    `items` is consumed lazily, so only O(limit) coroutines, sockets and
+    results exist at any time, whatever the input size. If the consumer
+    stops early or a call raises, the calls still in flight are cancelled.
+    """
+    iterator = iter(items)
+    running = {}  # task -> item
+
+    try:
+        while True:
+            while len(running) < limit:
+                item = next(iterator, _DONE)
+                if item is _DONE:
+                    break
+                running[asyncio.ensure_future(func(item))] = item
+            if not running:
+                return
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield running.pop(task), task.result()
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
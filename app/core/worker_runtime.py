@@ -0,0 +1,78 @@
+# app/core/worker_runtime.py
+import asyncio
+import threading
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import create_async_db_engine
+from app.logic.smtp_pool import smtp_pool
+
+
+class WorkerRuntime:
+    """
+    Async runtime of one Celery worker process: a single event loop,
+    running for the life of the process in a background thread, plus
+    the async DB pool bound to it.
+
+    Tasks hand their coroutines to `run()` instead of asyncio.run(), so the
+    loop-bound state (resolver cache and aiodns channel, SMTP session pool,
+    catch-all redis client, DB connections) survives from task to task.
+
+    Started from Celery's worker_process_init (after the fork, so nothing
+    is shared between children); `run()` also starts it lazily, e.g. for
+    the solo pool or eager tasks.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.engine = None
+        self._session_factory = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="worker-runtime", daemon=True)
+            self._thread.start()
+            self.engine = create_async_db_engine(settings.worker_db_pool_size,
+                                                 settings.worker_db_max_overflow)
+            self._session_factory = async_sessionmaker(
+                self.engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+            )
+            self.loop = loop
+
+    def run(self, coro):
+        """Run `coro` on the worker loop and block until it returns."""
+        if self.loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def session(self) -> AsyncSession:
+        """New AsyncSession from the worker pool; use inside coroutines passed to run()."""
+        if self._session_factory is None:
+            self.start()
+        return self._session_factory()
+
+    async def _close(self) -> None:
+        await smtp_pool.close_all()
+        await self.engine.dispose()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self.loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout=10)
+            finally:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self._thread.join(timeout=5)
+                self.loop.close()
+                self.loop = None
+
+
+# 👇 one runtime per worker process (see celery_worker signals)
+runtime = WorkerRuntime()
@@ -1,7 +1,18 @@
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from app.models.email import EmailValidation
 
+_RESULT_FIELDS = ("valid_syntax", "domain_exists", "mx_exists", "smtp_ok", "status", "score")
+
+
+def _upsert(rows: list[dict]):
+    """INSERT ... ON CONFLICT (email, user_id) DO UPDATE for EmailValidation rows."""
+    stmt = insert(EmailValidation).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[EmailValidation.email, EmailValidation.user_id],
+        set_={name: stmt.excluded[name] for name in _RESULT_FIELDS},
+    )
+
 
 async def save_validation_result(
     db: AsyncSession,
@@ -14,39 +25,34 @@ async def save_validation_result(
     score: int,
     user_id: int,
 ):
-    """Save or update validation result in DB"""
-    # 🔍 check if record already exists
-    result = await db.execute(
-        select(EmailValidation).where(EmailValidation.email == email, EmailValidation.user_id == user_id)
-    )
-    record = result.scalar_one_or_none()
-
-    if record:
-        # update existing record
-        record.valid_syntax = valid_syntax
-        record.domain_exists = domain_exists
-        record.mx_exists = mx_exists
-        record.smtp_ok = smtp_ok
-        record.status = status
-        record.score = score
-    else:
-        # create new record
-        record = EmailValidation(
-            user_id=user_id,
-            email=email,
-            valid_syntax=valid_syntax,
-            domain_exists=domain_exists,
-            mx_exists=mx_exists,
-            smtp_ok=smtp_ok,
-            status=status,
-            score=score,
-        )
-        db.add(record)
-
+    """Save or update validation result in DB (one upsert round-trip)"""
+    stmt = _upsert([{
+        "user_id": user_id,
+        "email": email,
+        "valid_syntax": valid_syntax,
+        "domain_exists": domain_exists,
+        "mx_exists": mx_exists,
+        "smtp_ok": smtp_ok,
+        "status": status,
+        "score": score,
+    }]).returning(EmailValidation)
+    record = (await db.execute(stmt)).scalar_one()
     await db.commit()
-    await db.refresh(record)
     return record
 
+
+async def upsert_validation_results(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    Save many results in one multi-row upsert (not committed).
+    Rows are dicts of EmailValidation columns, at most one per (email, user_id);
+    they are written in key order, so concurrent batches lock rows in the
+    same order and can't deadlock.
+    """
+    if not rows:
+        return
+    rows = sorted(rows, key=lambda row: (row["email"], row["user_id"]))
+    await db.execute(_upsert(rows))
+
 # existing async save_validation_result remains untouched
 
 def save_validation_result_sync(db, email: str, valid_syntax: bool, domain_exists: bool,
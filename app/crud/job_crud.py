@@ -0,0 +1,269 @@
+# app/crud/job_crud.py
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job import ValidationJob, JobChunk, JobResult
+from app.utils.credits import reserve_credits_sync, release_credits_sync
+
+
+def create_job_sync(db: Session, user_id: int, kind: str, total: int, chunks: list[dict],
+                    spool_path: str | None = None, task_id: str | None = None) -> ValidationJob | None:
+    """
+    Create a job with its chunks (dicts of JobChunk columns: first_row,
+    rows, credits_reserved and offset or emails), numbered in order.
+    The credits of all chunks are reserved in the same transaction;
+    returns None (and creates nothing) if the balance doesn't cover them.
+    """
+    job = ValidationJob(id=str(uuid.uuid4()), user_id=user_id, kind=kind, total=total,
+                        counts={}, spool_path=spool_path, task_id=task_id)
+    db.add(job)
+    db.add_all(JobChunk(job_id=job.id, chunk=i, counts={}, **chunk) for i, chunk in enumerate(chunks))
+    db.flush()
+    reserved = sum(chunk.get("credits_reserved", 0) for chunk in chunks)
+    if reserve_credits_sync(db, user_id, reserved, job_id=job.id) is None:
+        db.rollback()
+        return None
+    job.credits_reserved = reserved
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _stale_chunk():
+    """Queued chunk with no checkpoint for chunk_stale_after: its worker is gone."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.chunk_stale_after)
+    return (JobChunk.status == "queued") & (JobChunk.updated_at < cutoff)
+
+
+def requeue_chunks_sync(db: Session, job: ValidationJob) -> bool:
+    """
+    Put a job's failed, cancelled and stale chunks back to "pending" for the
+    scheduler, reserving again the credits their remaining rows may use
+    (settled chunks gave them back). Queued chunks that still checkpoint may
+    be running and are left alone. False (nothing changed) if the balance
+    is too low. Not committed.
+    """
+    chunks = (
+        db.query(JobChunk)
+        .filter(JobChunk.job_id == job.id,
+                or_(JobChunk.status.in_(("failed", "cancelled")), _stale_chunk()))
+        .with_for_update()
+        .all()
+    )
+    top_up = {chunk.id: max(chunk.credits_used + chunk.rows - chunk.processed - chunk.credits_reserved, 0)
+              for chunk in chunks}
+    amount = sum(top_up.values())
+    if amount and reserve_credits_sync(db, job.user_id, amount, job_id=job.id) is None:
+        db.rollback()
+        return False
+    for chunk in chunks:
+        chunk.status = "pending"
+        chunk.credits_reserved += top_up[chunk.id]
+    return True
+
+
+def settle_chunk_sync(db: Session, job_id: str, chunk: int) -> int:
+    """
+    Settle a chunk's reservation down to the credits it actually used,
+    refunding rows that were deduplicated, failed or never run. Idempotent
+    (a settled chunk has nothing left to give back). Returns the refund.
+    """
+    row = (
+        db.query(JobChunk)
+        .filter(JobChunk.job_id == job_id, JobChunk.chunk == chunk)
+        .with_for_update()
+        .one()
+    )
+    refund = row.credits_reserved - row.credits_used
+    if refund:
+        user_id = db.query(ValidationJob.user_id).filter(ValidationJob.id == job_id).scalar()
+        release_credits_sync(db, user_id, refund, job_id=job_id)
+        row.credits_reserved = row.credits_used
+    db.commit()
+    return refund
+
+
+def settle_cancelled_chunks_sync(db: Session, job_id: str) -> int:
+    """Settle the chunks a cancel dropped before they ran (see cancel_job)."""
+    chunks = db.query(JobChunk.chunk).filter(JobChunk.job_id == job_id, JobChunk.status == "cancelled")
+    return sum(settle_chunk_sync(db, job_id, chunk) for (chunk,) in chunks.all())
+
+
+def set_chunk_status_sync(db: Session, job_id: str, chunk: int, status: str) -> None:
+    db.query(JobChunk).filter(JobChunk.job_id == job_id, JobChunk.chunk == chunk).update(
+        {"status": status}, synchronize_session=False
+    )
+    db.commit()
+
+
+def _roll_up(db: Session, job_id: str) -> dict:
+    """Totals of a job's chunk checkpoints (one row per chunk, not per address)."""
+    chunks = (
+        db.query(JobChunk.processed, JobChunk.unique, JobChunk.credits_used,
+                 JobChunk.credits_reserved, JobChunk.counts)
+        .filter(JobChunk.job_id == job_id)
+        .all()
+    )
+    counts = {}
+    for chunk in chunks:
+        for name, n in (chunk.counts or {}).items():
+            counts[name] = counts.get(name, 0) + n
+    return {
+        "processed": sum(c.processed for c in chunks),
+        "unique": sum(c.unique for c in chunks),
+        "credits_used": sum(c.credits_used for c in chunks),
+        "credits_reserved": sum(c.credits_reserved for c in chunks),
+        "counts": counts,
+    }
+
+
+def finish_job_sync(db: Session, job_id: str, status: str = "done") -> ValidationJob | None:
+    """Roll the chunk checkpoints up into the job row."""
+    job = db.get(ValidationJob, job_id)
+    if job is None:
+        return None
+    for name, value in _roll_up(db, job_id).items():
+        setattr(job, name, value)
+    job.status = status
+    if status in ("done", "cancelled"):
+        job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return job
+
+
+def job_progress_sync(db: Session, job_id: str) -> dict | None:
+    """
+    Progress of a job from its chunk checkpoints: rows processed, status
+    counts, throughput (addresses/s since the job started) and ETA (s).
+    """
+    job = db.get(ValidationJob, job_id)
+    if job is None:
+        return None
+    totals = _roll_up(db, job_id)
+    processed = totals["processed"]
+    elapsed = (datetime.now(timezone.utc) - job.created_at).total_seconds()
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    remaining = max(job.total - processed, 0)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "total": job.total,
+        "processed": processed,
+        "valid": totals["counts"].get("valid", 0),
+        "invalid": totals["counts"].get("invalid", 0),
+        "counts": totals["counts"],
+        "credits_used": totals["credits_used"],
+        "rate": round(rate, 1),
+        "eta": round(remaining / rate) if rate and job.status == "running" else None,
+    }
+
+
+async def get_chunk(db: AsyncSession, job_id: str, chunk: int) -> tuple[ValidationJob, JobChunk]:
+    result = await db.execute(
+        select(ValidationJob, JobChunk)
+        .join(JobChunk, JobChunk.job_id == ValidationJob.id)
+        .where(ValidationJob.id == job_id, JobChunk.chunk == chunk)
+    )
+    return result.one()
+
+
+async def get_results_for_rows(db: AsyncSession, job_id: str, rows: list[int]) -> list[JobResult]:
+    result = await db.execute(
+        select(JobResult).where(JobResult.job_id == job_id, JobResult.row.in_(rows))
+    )
+    return list(result.scalars())
+
+
+async def save_checkpoint(db: AsyncSession, chunk_id: int, **values) -> None:
+    """Update a chunk's checkpoint (not committed, see save_job_results)."""
+    await db.execute(update(JobChunk).where(JobChunk.id == chunk_id).values(**values))
+
+
+async def save_job_results(db: AsyncSession, job_id: str, rows: list[tuple[int, dict]]) -> None:
+    """
+    Store (row index, report) pairs of a job in one multi-row INSERT
+    (not committed: the caller commits it with the chunk checkpoint).
+    A retried chunk overwrites its earlier rows instead of duplicating them.
+    """
+    if not rows:
+        return
+    stmt = insert(JobResult).values([
+        {
+            "job_id": job_id,
+            "row": row,
+            "email": report["email"],
+            "status": report["status"],
+            "score": report["score"],
+            "details": report["details"],
+        }
+        for row, report in rows
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobResult.job_id, JobResult.row],
+        set_={
+            "email": stmt.excluded.email,
+            "status": stmt.excluded.status,
+            "score": stmt.excluded.score,
+            "details": stmt.excluded.details,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def get_job_status(db: AsyncSession, job_id: str) -> str | None:
+    result = await db.execute(select(ValidationJob.status).where(ValidationJob.id == job_id))
+    return result.scalar_one_or_none()
+
+
+async def cancel_job(db: AsyncSession, job_id: str) -> bool:
+    """
+    Stop a running job: pending chunks are dropped, queued and running ones
+    stop at their next checkpoint (and settle their own credits).
+    False if the job was no longer running.
+    """
+    result = await db.execute(
+        update(ValidationJob)
+        .where(ValidationJob.id == job_id, ValidationJob.status == "running")
+        .values(status="cancelled")
+    )
+    if not result.rowcount:
+        return False
+    await db.execute(
+        update(JobChunk)
+        .where(JobChunk.job_id == job_id, JobChunk.status == "pending")
+        .values(status="cancelled")
+    )
+    await db.commit()
+    return True
+
+
+async def job_is_stalled(db: AsyncSession, job_id: str) -> bool:
+    """True if a queued chunk of the job stopped checkpointing (see chunk_stale_after)."""
+    result = await db.execute(
+        select(JobChunk.id).where(JobChunk.job_id == job_id, _stale_chunk()).limit(1)
+    )
+    return result.first() is not None
+
+
+async def get_job(db: AsyncSession, job_id: str, user_id: int) -> ValidationJob | None:
+    result = await db.execute(
+        select(ValidationJob).where(ValidationJob.id == job_id, ValidationJob.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_job_results(db: AsyncSession, job_id: str, after: int = -1, limit: int = 100,
+                          status: str | None = None) -> list[JobResult]:
+    """One page of results in input order, starting after row `after` (keyset, no OFFSET)."""
+    query = select(JobResult).where(JobResult.job_id == job_id, JobResult.row > after)
+    if status:
+        query = query.where(JobResult.status == status)
+    result = await db.execute(query.order_by(JobResult.row).limit(limit))
+    return list(result.scalars())
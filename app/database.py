@@ -8,19 +8,54 @@ DATABASE_URL = os.environ.get("DATABASE_URL")  # provided by Render
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set!")
 
-engine = create_engine(DATABASE_URL)
+# -----------------------------
+# Sync engine (Celery tasks)
+# -----------------------------
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=settings.sync_db_pool_size,
+    max_overflow=settings.sync_db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str = DATABASE_URL) -> str:
+    """Same database, asyncpg driver (postgres:// and postgresql+psycopg2:// are rewritten)."""
+    scheme, sep, rest = url.partition("://")
+    if scheme.split("+")[0] in ("postgres", "postgresql"):
+        scheme = "postgresql+asyncpg"
+    return f"{scheme}{sep}{rest}"
+
+
+def create_async_db_engine(pool_size: int, max_overflow: int):
+    """
+    asyncpg engine with the pool settings from config. Bound to the event
+    loop it is first used on: one for the web app, one per worker runtime.
+    """
+    return create_async_engine(
+        async_database_url(),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"statement_cache_size": settings.db_statement_cache_size},
+    )
+
 # -----------------------------
 # Base class for models
 # -----------------------------
 Base = declarative_base()
 
 # -----------------------------
-# Async session factory
+# Async engine + session factory (web app)
 # -----------------------------
+async_engine = create_async_db_engine(settings.db_pool_size, settings.db_max_overflow)
+
 async_session = async_sessionmaker(
-    bind=engine,
+    bind=async_engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False
@@ -31,7 +66,9 @@ async_session = async_sessionmaker(
 # -----------------------------
 async def get_db() -> AsyncSession:
     """
-    Async session dependency for FastAPI routes
+    Async session dependency for FastAPI routes: one session per request,
+    closed (and its connection returned to the pool) when the request ends.
+    Concurrent work inside a request takes its own sessions from async_session.
     Usage: db: AsyncSession = Depends(get_db)
     """
     async with async_session() as session:
@@ -18,9 +18,3 @@ async def get_current_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
-
-
-# Dependency for FastAPI routes
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
\ No newline at end of file
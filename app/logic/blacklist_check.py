@@ -1,6 +1,7 @@
 # app/logic/blacklist_check.py
+from app.logic.domain_lists import DomainList
 
-BLACKLISTED_DOMAINS = {"spam.com", "fakeemail.com", "baddomain.org"}
+BLACKLISTED_DOMAINS = DomainList("blacklisted_domains.txt")
 
 def check_blacklist(email: str) -> bool:
     """
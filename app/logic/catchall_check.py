@@ -1,23 +1,90 @@
-import smtplib
-import socket
-import dns.resolver
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 
-def check_catchall(email: str) -> bool:
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+
+class CatchallCache:
     """
-    Detect if domain is catch-all
-    Simple attempt: test a random email on the domain
+    Per-domain catch-all verdicts with a TTL.
+    Kept in process memory (LRU-capped) and, when `redis_url` is set,
+    shared through Redis so every web/worker process reuses them.
     """
-    try:
-        domain = email.split("@")[1]
-        mx_records = dns.resolver.resolve(domain, "MX")
-        mx_host = str(mx_records[0].exchange)
-
-        server = smtplib.SMTP(timeout=5)
-        server.connect(mx_host)
-        server.helo(socket.gethostname())
-        # Send to a random address
-        code, _ = server.rcpt(f"randomcatchall_{domain}@{domain}")
-        server.quit()
-        return code == 250
-    except Exception:
-        return False
+
+    def __init__(self, ttl: int, max_size: int, redis_url: str = ""):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.redis_url = redis_url
+        self._cache: OrderedDict = OrderedDict()  # domain -> (expires_at, verdict)
+        self._lock = threading.Lock()
+        self._redis = {}  # event loop -> redis client
+
+    def _client(self):
+        if not self.redis_url:
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._redis.get(loop)
+        if client is None:
+            for old_loop in [l for l in self._redis if l.is_closed()]:
+                del self._redis[old_loop]
+            client = aioredis.from_url(self.redis_url, socket_timeout=1)
+            self._redis[loop] = client
+        return client
+
+    def _remember(self, domain: str, verdict: bool, ttl: float) -> None:
+        with self._lock:
+            self._cache[domain] = (time.monotonic() + ttl, verdict)
+            self._cache.move_to_end(domain)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    async def get(self, domain: str) -> bool | None:
+        """Cached verdict for `domain`, or None if unknown/expired."""
+        domain = domain.lower()
+        with self._lock:
+            entry = self._cache.get(domain)
+            if entry is not None:
+                expires_at, verdict = entry
+                if expires_at >= time.monotonic():
+                    self._cache.move_to_end(domain)
+                    return verdict
+                del self._cache[domain]
+
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            value, ttl = await asyncio.gather(
+                client.get(f"catchall:{domain}"), client.ttl(f"catchall:{domain}")
+            )
+        except Exception:
+            return None  # Redis is an optimization, never a hard dependency
+        if value is None:
+            return None
+        verdict = value == b"1"
+        self._remember(domain, verdict, ttl if ttl > 0 else self.ttl)
+        return verdict
+
+    async def set(self, domain: str, verdict: bool) -> None:
+        domain = domain.lower()
+        self._remember(domain, verdict, self.ttl)
+
+        client = self._client()
+        if client is None:
+            return
+        try:
+            await client.set(f"catchall:{domain}", "1" if verdict else "0", ex=self.ttl)
+        except Exception:
+            pass
+
+
+# 👇 shared catch-all verdict cache for the process
+catchall_cache = CatchallCache(
+    ttl=settings.catchall_cache_ttl,
+    max_size=settings.catchall_cache_size,
+    redis_url=settings.redis_url,
+)
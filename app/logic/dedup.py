@@ -0,0 +1,30 @@
+# app/logic/dedup.py
+
+# Providers that ignore dots in the local part (and their alias domains)
+DOTLESS_DOMAINS = {
+    "gmail.com": "gmail.com",
+    "googlemail.com": "gmail.com",
+}
+
+
+def canonical_email(email: str) -> str:
+    """
+    Key identifying the mailbox behind an address, for deduplication:
+      - case-insensitive ("John@X.com" == "john@x.com")
+      - "+tag" subaddresses dropped (same rule as check_alias_forward_check)
+      - dots ignored on Gmail, googlemail.com folded into gmail.com
+    Addresses with the same key share every lookup (DNS, whois, SMTP);
+    only the cheap local-part checks differ between them.
+    """
+    email = email.strip()
+    local, sep, domain = email.rpartition("@")
+    if not sep:
+        return email.lower()
+
+    local = local.lower()
+    domain = domain.lower().rstrip(".")
+    local = local.split("+", 1)[0] or local
+    if domain in DOTLESS_DOMAINS:
+        local = local.replace(".", "")
+        domain = DOTLESS_DOMAINS[domain]
+    return f"{local}@{domain}"
@@ -1,8 +1,6 @@
-DISPOSABLE_DOMAINS = {
-    "mailinator.com",
-    "10minutemail.com",
-    "tempmail.com",
-}
+from app.logic.domain_lists import DomainList
+
+DISPOSABLE_DOMAINS = DomainList("disposable_domains.txt")
 
 def check_disposable(email: str) -> bool:
     """Detect if domain is in disposable list"""
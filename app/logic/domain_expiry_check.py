@@ -1,10 +1,17 @@
-import whois
+from datetime import datetime, timezone
+from app.services.domain_expiry import domain_expiry_service
 
-def check_domain_expiry(email: str) -> bool:
-    """Check if the domain is active (not expired)"""
+async def check_domain_expiry(email: str) -> bool | None:
+    """
+    Check if the domain is active (not expired).
+    None when the expiry date is unknown (WHOIS timeout/rate limit, or a TLD
+    that publishes none), so only a registration known to be past counts.
+    """
     try:
         domain = email.split("@")[1]
-        w = whois.whois(domain)
-        return w.expiration_date is not None
+        expiry = await domain_expiry_service.get_expiry(domain)
     except Exception:
-        return False
+        return None
+    if expiry is None:
+        return None
+    return expiry > datetime.now(timezone.utc)
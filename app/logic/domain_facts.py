@@ -0,0 +1,12 @@
+# app/logic/domain_facts.py
+from app.logic.pipeline import pipeline, DOMAIN_CHECKS
+
+
+async def collect_domain_facts(email: str) -> dict:
+    """
+    Run the checks whose result depends only on the domain.
+    Only the domain part of `email` is used, so any address of a
+    domain can stand in for all of them.
+    """
+    results = await pipeline.run(email, deep=True, only=DOMAIN_CHECKS)
+    return {name: results.get(name) for name in DOMAIN_CHECKS}
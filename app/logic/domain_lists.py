@@ -0,0 +1,77 @@
+# app/logic/domain_lists.py
+import os
+import time
+from pathlib import Path
+
+from app.config import settings
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+class DomainList:
+    """
+    Large, hot-reloadable list of domains (or local parts) loaded from a
+    text file: one entry per line, '#' starts a comment.
+
+    With `match_subdomains=True` an entry also matches every subdomain
+    ("mailinator.com" matches "x.mailinator.com"). A lookup probes one
+    hash per label of the query, so it costs O(label count) no matter
+    how long the list is, and runs inline with no thread hop.
+
+    The file is re-read when its mtime changes (checked at most every
+    `domain_list_reload_interval` seconds); the new set replaces the old
+    one in a single assignment, so readers never see a half-loaded list.
+    """
+
+    def __init__(self, filename: str, match_subdomains: bool = True):
+        self.path = Path(settings.domain_lists_dir or DATA_DIR) / filename
+        self.match_subdomains = match_subdomains
+        self._entries = frozenset()
+        self._mtime = None
+        self._next_check = 0.0
+        self.reload()
+
+    def reload(self) -> None:
+        """(Re)load the file now; keeps the current entries if it is missing."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, encoding="utf-8") as f:
+                entries = frozenset(
+                    line.split("#", 1)[0].strip().lower().rstrip(".")
+                    for line in f
+                ) - {""}
+        except FileNotFoundError:
+            return
+        self._entries = entries  # atomic swap
+        self._mtime = mtime
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + settings.domain_list_reload_interval
+        try:
+            if os.stat(self.path).st_mtime_ns != self._mtime:
+                self.reload()
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, name: str) -> bool:
+        self._maybe_reload()
+        entries = self._entries
+        name = name.lower().rstrip(".")
+        if name in entries:
+            return True
+        if not self.match_subdomains:
+            return False
+        # Walk parent domains: a.b.example.com -> b.example.com -> example.com -> com
+        dot = name.find(".")
+        while dot != -1:
+            name = name[dot + 1:]
+            if name in entries:
+                return True
+            dot = name.find(".")
+        return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
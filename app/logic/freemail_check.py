@@ -1,11 +1,7 @@
-import asyncio
-import dns.resolver
+from app.logic.domain_lists import DomainList
 
-FREEMAIL_DOMAINS = {
-    "gmail.com", "yahoo.com", "hotmail.com", "outlook.com",
-    "mailinator.com", "10minutemail.com",
-}
+FREEMAIL_DOMAINS = DomainList("freemail_domains.txt")
 
-async def check_freemail(email: str) -> bool:
+def check_freemail(email: str) -> bool:
     domain = email.split("@")[-1].lower()
-    return await asyncio.to_thread(lambda: domain in free_providers)
+    return domain in FREEMAIL_DOMAINS
@@ -1,13 +1,10 @@
 # app/logic/mx_check.py
-import asyncio
-import dns.resolver
+from app.core.dns_resolver import resolver
 
 async def check_mx_record(email: str) -> bool:
     """Check MX record (async-safe)."""
     domain = email.split("@")[-1]
     try:
-        return await asyncio.to_thread(
-            lambda: bool(dns.resolver.resolve(domain, "MX"))
-        )
+        return bool(await resolver.resolve(domain, "MX"))
     except Exception:
         return False
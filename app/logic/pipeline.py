@@ -0,0 +1,292 @@
+# app/logic/pipeline.py
+import asyncio
+import inspect
+
+from app.logic.syntax_check import check_syntax
+from app.logic.blacklist_check import check_blacklist
+from app.logic.role_check import check_role
+from app.logic.freemail_check import check_freemail
+from app.logic.alias_forward_check import check_alias_forward_check
+from app.logic.mx_check import check_mx_record
+from app.logic.spf_check import check_spf
+from app.logic.dkim_check import check_dkim
+from app.logic.dmarc_check import check_dmarc
+from app.logic.domain_expiry_check import check_domain_expiry
+from app.logic.smtp_check import probe_mailbox, PENDING
+from app.config import settings
+from app.core.deadline import Deadline
+
+# -----------------------------
+# Scoring (the single source of truth for every entry point)
+# -----------------------------
+# Positive weights are earned when the check passes; negative weights
+# are applied when the flag is raised (catch-all, role account, ...).
+WEIGHTS = {
+    "syntax": 20,
+    "mx": 20,
+    "spf": 10,
+    "dkim": 10,
+    "blacklist": 20,   # earned when NOT blacklisted
+    "smtp": 20,
+    "catchall": -10,
+    "role": -5,
+    "free": -5,
+    "alias_forward": -5,
+    "domain_expired": -20,
+}
+
+
+def categorize_email(score: int) -> str:
+    if score >= 70:
+        return "valid"
+    elif score >= 40:
+        return "possibly valid"
+    elif score >= 20:
+        return "risky"
+    return "invalid"
+
+
+def compute_score(results: dict) -> int:
+    """Score (0-100) from raw check results; None means not run / unknown."""
+    if not results.get("syntax") or results.get("blacklist"):
+        return 0
+
+    score = WEIGHTS["syntax"]
+    for name in ("mx", "spf", "dkim"):
+        if results.get(name):
+            score += WEIGHTS[name]
+    if results.get("blacklist") is False:
+        score += WEIGHTS["blacklist"]
+    if results.get("smtp") is True:
+        score += WEIGHTS["smtp"]
+
+    for name in ("catchall", "role", "free", "alias_forward"):
+        if results.get(name) is True:
+            score += WEIGHTS[name]
+    if results.get("domain_active") is False:
+        score += WEIGHTS["domain_expired"]
+
+    return max(0, min(100, score))
+
+
+def compute_status(results: dict, score: int) -> str:
+    if results.get("smtp") == PENDING:
+        return PENDING  # greylisted: re-probed later
+    return categorize_email(score)
+
+
+# Values a result can take at the top/bottom of the score range
+BEST_CASE = {
+    "syntax": True, "mx": True, "spf": True, "dkim": True, "dmarc": True,
+    "blacklist": False, "smtp": True, "catchall": False, "role": False,
+    "free": False, "alias_forward": False, "domain_active": True,
+}
+WORST_CASE = {name: not value for name, value in BEST_CASE.items()}
+
+
+def score_bounds(results: dict, remaining: set) -> tuple[int, int]:
+    """
+    (worst, best) final score when the `remaining` results are still open.
+    Every weight is independent, so mixing outcomes (or leaving a result
+    unknown) always lands between the two.
+    """
+    worst = compute_score({**results, **{n: WORST_CASE.get(n) for n in remaining}})
+    best = compute_score({**results, **{n: BEST_CASE.get(n) for n in remaining}})
+    return worst, best
+
+
+def category_decided(results: dict, remaining: set, categorize=categorize_email) -> bool:
+    """True when no outcome of the `remaining` checks can change the category."""
+    worst, best = score_bounds(results, remaining)
+    return categorize(worst) == categorize(best)
+
+
+# -----------------------------
+# Check graph
+# -----------------------------
+# Cost tiers, cheapest first
+COST_STATIC = 0   # in-memory lists and regexes
+COST_DNS = 1      # resolver lookups (mostly served from its cache)
+COST_NETWORK = 2  # remote probes: live SMTP conversation with the MX, port-43 WHOIS
+
+# Share of a request deadline each tier gets (static checks need none)
+TIER_SHARE = {COST_STATIC: 0, COST_DNS: 1, COST_NETWORK: 2}
+
+
+class Check:
+    """
+    One node of the validation DAG.
+    `func(email)` may be sync or async. The check only runs when every
+    dependency returned True; otherwise its result is None (skipped).
+    A check with `provides` returns a dict and fills several results.
+    `cost` is its tier; dependencies must sit in the same or a cheaper tier.
+    """
+
+    def __init__(self, name: str, func, deps: tuple = (), deep: bool = False,
+                 domain_level: bool = False, provides: tuple = (),
+                 cost: int = COST_STATIC):
+        self.name = name
+        self.func = func
+        self.deps = deps
+        self.deep = deep
+        self.domain_level = domain_level
+        self.provides = provides or (name,)
+        self.cost = cost
+
+
+async def _probe_smtp(email: str) -> dict:
+    verdict = await probe_mailbox(email)
+    return {"smtp": verdict["smtp"], "catchall": verdict["catchall"]}
+
+
+# Tiers run cheapest first; within a tier dependencies decide scheduling.
+# SMTP and WHOIS share the last tier: neither needs the other, so they run
+# side by side and the deep latency is DNS + the slower of the two.
+#   syntax ─┬─ blacklist, role, free, alias_forward
+#           ├─ mx ─┬─ smtp (+ catchall)
+#           │      └─ domain_active (whois)
+#           └─ spf, dkim, dmarc
+CHECKS = [
+    Check("syntax", check_syntax),
+    Check("blacklist", check_blacklist, deps=("syntax",), domain_level=True),
+    Check("role", check_role, deps=("syntax",)),
+    Check("free", check_freemail, deps=("syntax",), domain_level=True),
+    Check("alias_forward", check_alias_forward_check, deps=("syntax",)),
+    Check("mx", check_mx_record, deps=("syntax",), deep=True, domain_level=True, cost=COST_DNS),
+    Check("spf", check_spf, deps=("syntax",), deep=True, domain_level=True, cost=COST_DNS),
+    Check("dkim", check_dkim, deps=("syntax",), deep=True, domain_level=True, cost=COST_DNS),
+    Check("dmarc", check_dmarc, deps=("syntax",), deep=True, domain_level=True, cost=COST_DNS),
+    Check("domain_active", check_domain_expiry, deps=("mx",), deep=True, domain_level=True,
+          cost=COST_NETWORK),
+    Check("smtp", _probe_smtp, deps=("mx",), deep=True, provides=("smtp", "catchall"),
+          cost=COST_NETWORK),
+]
+
+DOMAIN_CHECKS = tuple(c.name for c in CHECKS if c.domain_level)
+
+# Results that stop the whole pipeline and cancel in-flight checks
+EARLY_EXIT = {
+    "syntax": lambda value: value is False,
+    "blacklist": lambda value: value is True,
+}
+
+
+class ValidationPipeline:
+    """
+    Runs the check DAG for one address, one cost tier at a time (static
+    lists, DNS, then SMTP + whois). Inside a tier each check starts as soon as
+    its dependencies are done, so independent checks overlap.
+
+    Between tiers the best- and worst-case final scores are computed; once
+    both fall in the same category the expensive tiers are skipped and
+    their results stay None. An early-exit result cancels everything
+    still in flight.
+
+    With a Deadline, each tier gets its TIER_SHARE of the time left when
+    it starts (time a tier doesn't use flows to the next one). A check
+    still running when its tier's slice is over returns None (unknown).
+    """
+
+    def __init__(self, checks: list[Check], early_exit: dict):
+        self.checks = {c.name: c for c in checks}
+        self.early_exit = early_exit
+
+    def _select(self, deep: bool, only: tuple | None) -> list[Check]:
+        wanted = set(only) if only else {c.name for c in self.checks.values() if deep or not c.deep}
+        # Pull in dependencies of the selected checks
+        stack = list(wanted)
+        while stack:
+            for dep in self.checks[stack.pop()].deps:
+                if dep not in wanted:
+                    wanted.add(dep)
+                    stack.append(dep)
+        return [c for c in self.checks.values() if c.name in wanted]
+
+    async def run(self, email: str, deep: bool = True, known: dict | None = None,
+                  only: tuple | None = None, deadline: Deadline | None = None) -> dict:
+        """
+        Run the selected checks and return {result name: value}.
+        `known` holds results computed elsewhere (e.g. shared domain facts);
+        those checks are not run again. `only` limits the run to some checks
+        (plus their dependencies); such partial runs never skip a tier,
+        since the score they would bound is computed later.
+        `deadline` bounds the whole run (see class docstring).
+        """
+        known = known or {}
+        results = {}
+        tasks = {}
+
+        loop = asyncio.get_running_loop()
+
+        async def run_check(check: Check, until: float | None):
+            for dep in check.deps:
+                if await tasks[dep] is not True:
+                    return None
+            try:
+                value = check.func(email)
+                if inspect.isawaitable(value):
+                    if until is None:
+                        value = await value
+                    else:
+                        value = await deadline.run(value, until - loop.time())
+                return value
+            except Exception:
+                return None
+
+        selected = self._select(deep, only)
+        bound = settings.validation_score_bound and not only
+        tiers = sorted({c.cost for c in selected})
+        for tier in tiers:
+            stage = [c for c in selected if c.cost == tier]
+            if bound and tier > COST_STATIC:
+                # Known results are free; only the checks still to run are open
+                open_checks = [c for c in selected if c.cost >= tier]
+                remaining = {n for c in open_checks for n in c.provides if n not in known}
+                if remaining and category_decided({**results, **known}, remaining):
+                    results.update({n: known[n] for c in open_checks
+                                    for n in c.provides if n in known})
+                    break
+
+            until = None
+            if deadline is not None and TIER_SHARE.get(tier):
+                total = sum(TIER_SHARE.get(t, 0) for t in tiers if t >= tier)
+                until = loop.time() + deadline.share(TIER_SHARE[tier], total)
+
+            for check in stage:
+                if all(name in known for name in check.provides):
+                    future = loop.create_future()
+                    future.set_result(known[check.name] if len(check.provides) == 1
+                                      else {name: known[name] for name in check.provides})
+                    tasks[check.name] = future
+                else:
+                    tasks[check.name] = asyncio.ensure_future(run_check(check, until))
+
+            pending = {tasks[c.name] for c in stage}
+            names = {tasks[c.name]: c.name for c in stage}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                stop = False
+                for task in done:
+                    name = names[task]
+                    value = task.result()
+                    check = self.checks[name]
+                    if len(check.provides) > 1:
+                        value = value or {}
+                        for key in check.provides:
+                            results[key] = value.get(key)
+                    else:
+                        results[name] = value
+                    rule = self.early_exit.get(name)
+                    if rule and rule(results[name]):
+                        stop = True
+                if stop:
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    return results
+
+        return results
+
+
+# 👇 the one pipeline used by services.email_validator and logic.runner
+pipeline = ValidationPipeline(CHECKS, EARLY_EXIT)
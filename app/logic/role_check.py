@@ -1,11 +1,7 @@
-import asyncio
-import dns.resolver
+from app.logic.domain_lists import DomainList
 
-ROLE_EMAILS = {
-    "admin", "info", "support", "contact", "sales", "webmaster"
-}
+ROLE_EMAILS = DomainList("role_accounts.txt", match_subdomains=False)
 
-async def check_role(email: str) -> bool:
+def check_role(email: str) -> bool:
     local = email.split("@")[0].lower()
-    role_accounts = ["admin", "support", "info", "sales"]
-    return await asyncio.to_thread(lambda: local in role_accounts)
+    return local in ROLE_EMAILS
@@ -1,19 +1,91 @@
-import smtplib
-import socket
-import dns.resolver
+import uuid
+from app.core.dns_resolver import resolve_mx
+from app.logic.smtp_pool import smtp_pool
+from app.logic.catchall_check import catchall_cache
 
-def check_smtp(email: str) -> bool:
-    """Attempt SMTP handshake to verify mailbox exists"""
+# Verdict for a temporarily rejected (greylisted) RCPT; re-probed later
+# by the reprobe_greylisted Celery task instead of retrying inline.
+PENDING = "pending"
+
+
+def _is_greylisted(code: int | None) -> bool:
+    return code is not None and 400 <= code < 500
+
+
+async def check_smtp(email: str) -> bool | str:
+    """
+    Attempt SMTP handshake to verify mailbox exists.
+    Returns "pending" when the server greylists the recipient (4xx).
+    """
     try:
         domain = email.split("@")[1]
-        mx_records = dns.resolver.resolve(domain, "MX")
-        mx_host = str(mx_records[0].exchange)
-        server = smtplib.SMTP(timeout=5)
-        server.connect(mx_host)
-        server.helo(socket.gethostname())
-        server.mail("test@example.com")
-        code, _ = server.rcpt(email)
-        server.quit()
+        mx_host = (await resolve_mx(domain))[0]
+        code = await smtp_pool.rcpt(mx_host, email)
+        if _is_greylisted(code):
+            return PENDING
         return code == 250
     except Exception:
         return False
+
+
+def _accepted(code: int | None) -> bool | None:
+    """250/251 -> True, 5xx -> False, anything else (4xx, no reply) -> unknown"""
+    if code in (250, 251):
+        return True
+    if code is not None and 500 <= code < 600:
+        return False
+    return None
+
+
+async def probe_mailbox(email: str) -> dict:
+    """
+    One MX lookup and one SMTP conversation covering mailbox, catch-all
+    and greylist verdicts:
+      smtp       -> True/False, or "pending" if the RCPT was greylisted
+      catchall   -> a random sentinel address on the domain was accepted
+                    (reused from the per-domain cache when known)
+      greylisted -> first RCPT was temporarily rejected (4xx)
+    Unknown verdicts are None.
+    """
+    verdict = {
+        "mx_host": None,
+        "smtp": False,
+        "catchall": None,
+        "greylisted": False,
+        "smtp_code": None,
+        "catchall_code": None,
+    }
+    try:
+        domain = email.split("@")[1]
+        mx_host = (await resolve_mx(domain))[0]
+    except Exception:
+        return verdict
+    verdict["mx_host"] = mx_host
+
+    cached_catchall = await catchall_cache.get(domain)
+    try:
+        if cached_catchall is not None:
+            # Catch-all status is a domain property: skip the sentinel RCPT
+            [smtp_code] = await smtp_pool.rcpt_many(mx_host, [email])
+            catchall_code = None
+        else:
+            sentinel = f"probe-{uuid.uuid4().hex[:16]}@{domain}"
+            smtp_code, catchall_code = await smtp_pool.rcpt_many(mx_host, [email, sentinel])
+    except Exception:
+        return verdict
+
+    catchall = cached_catchall
+    if catchall is None:
+        catchall = _accepted(catchall_code)
+        if catchall is not None:
+            await catchall_cache.set(domain, catchall)
+
+    greylisted = _is_greylisted(smtp_code)
+    verdict.update(
+        smtp=PENDING if greylisted else smtp_code == 250,
+        catchall=catchall,
+        greylisted=greylisted,
+        smtp_code=smtp_code,
+        catchall_code=catchall_code,
+    )
+    return verdict
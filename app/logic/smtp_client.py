@@ -0,0 +1,91 @@
+# app/logic/smtp_client.py
+import asyncio
+
+
+class SMTPDisconnected(ConnectionError):
+    """The server closed the connection."""
+
+
+class SMTPReplyError(Exception):
+    """The server answered a command with an unexpected reply code."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+class AsyncSMTPClient:
+    """
+    Minimal SMTP client on asyncio streams, just enough for RCPT probing.
+    Every network wait is bounded by `timeout` and can be cancelled.
+    """
+
+    def __init__(self, host: str, port: int = 25, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        code, message = await self._read_reply()
+        if code != 220:
+            self.close()
+            raise SMTPReplyError(code, message)
+
+    async def _read_reply(self) -> tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                self.close()
+                raise SMTPDisconnected(f"Connection to {self.host} closed")
+            line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            lines.append(line[4:])
+            # "250-..." continues a multi-line reply, "250 ..." ends it
+            if line[3:4] != "-":
+                return int(line[:3]), "\n".join(lines)
+
+    async def command(self, line: str) -> tuple[int, str]:
+        if self.writer is None:
+            raise SMTPDisconnected("Not connected")
+        self.writer.write(f"{line}\r\n".encode())
+        await asyncio.wait_for(self.writer.drain(), self.timeout)
+        return await self._read_reply()
+
+    async def helo(self, name: str) -> tuple[int, str]:
+        return await self.command(f"HELO {name}")
+
+    async def mail(self, sender: str) -> tuple[int, str]:
+        return await self.command(f"MAIL FROM:<{sender}>")
+
+    async def rcpt(self, recipient: str) -> tuple[int, str]:
+        return await self.command(f"RCPT TO:<{recipient}>")
+
+    async def rset(self) -> tuple[int, str]:
+        return await self.command("RSET")
+
+    async def quit(self) -> None:
+        try:
+            await self.command("QUIT")
+        except Exception:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Drop the connection without a QUIT (safe after errors or cancellation)."""
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except Exception:
+                pass
+        self.reader = self.writer = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.writer is not None
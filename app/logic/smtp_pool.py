@@ -0,0 +1,185 @@
+# app/logic/smtp_pool.py
+import asyncio
+import socket
+import time
+from collections import defaultdict
+
+from app.config import settings
+from app.logic.smtp_client import AsyncSMTPClient, SMTPDisconnected, SMTPReplyError
+from app.logic.smtp_scheduler import smtp_scheduler
+
+
+class SMTPSession:
+    """
+    One open SMTP conversation with an MX host, reused for many RCPT TO probes.
+    MAIL FROM is re-issued after RSET every `rcpt_per_transaction` recipients.
+    """
+
+    def __init__(self, mx_host: str):
+        self.mx_host = mx_host
+        self.client = None
+        self.loop = None
+        self.rcpt_total = 0        # recipients sent over this connection
+        self.rcpt_in_txn = 0       # recipients sent since the last MAIL FROM
+        self.last_used = 0.0
+
+    async def open(self) -> None:
+        self.client = AsyncSMTPClient(self.mx_host, settings.smtp_port, settings.smtp_timeout)
+        self.loop = asyncio.get_running_loop()
+        try:
+            await self.client.connect()
+            await self.client.helo(settings.smtp_helo_host or socket.gethostname())
+            await self._mail_from()
+        except BaseException:
+            self.abort()
+            raise
+        self.rcpt_total = 0
+        self.last_used = time.monotonic()
+
+    async def _mail_from(self) -> None:
+        code, msg = await self.client.mail(settings.smtp_mail_from)
+        if code != 250:
+            raise SMTPReplyError(code, msg)
+        self.rcpt_in_txn = 0
+
+    async def _new_transaction(self) -> None:
+        await self.client.rset()
+        await self._mail_from()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.rcpt_total >= settings.smtp_max_rcpt_per_session
+
+    @property
+    def idle_expired(self) -> bool:
+        return time.monotonic() - self.last_used > settings.smtp_idle_timeout
+
+    async def rcpt(self, email: str) -> int:
+        """Send one RCPT TO and return the reply code."""
+        if self.rcpt_in_txn >= settings.smtp_rcpt_per_transaction:
+            await self._new_transaction()
+
+        code, _ = await self.client.rcpt(email)
+        if code == 452 and self.rcpt_in_txn:
+            # "Too many recipients" for this transaction: start a new one and retry
+            await self._new_transaction()
+            code, _ = await self.client.rcpt(email)
+
+        self.rcpt_in_txn += 1
+        self.rcpt_total += 1
+        self.last_used = time.monotonic()
+        if code == 421:
+            # Server is closing the channel
+            self.abort()
+        return code
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.quit()
+            self.client = None
+
+    def abort(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.client is not None and self.client.is_connected
+
+
+class SMTPSessionPool:
+    """
+    Keeps idle SMTP sessions per MX host so bulk probes against the same
+    MX share a handful of connections instead of one handshake per address.
+    Expired sessions of hosts no longer probed are closed every
+    SWEEP_INTERVAL seconds, and hosts without idle sessions are forgotten.
+    """
+
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self):
+        self._idle = defaultdict(list)  # mx_host -> [SMTPSession]
+        self._swept = time.monotonic()
+
+    def _sweep(self) -> None:
+        for mx_host, sessions in list(self._idle.items()):
+            for session in [s for s in sessions if s.idle_expired]:
+                sessions.remove(session)
+                session.abort()
+            if not sessions:
+                del self._idle[mx_host]
+        self._swept = time.monotonic()
+
+    async def acquire(self, mx_host: str) -> SMTPSession:
+        loop = asyncio.get_running_loop()
+        if time.monotonic() - self._swept > self.SWEEP_INTERVAL:
+            self._sweep()
+        sessions = self._idle.pop(mx_host, [])
+        while sessions:
+            session = sessions.pop()
+            if session.loop is not loop:
+                # Opened on another (likely finished) event loop
+                session.abort()
+                continue
+            if session.is_open and not session.idle_expired and not session.exhausted:
+                if sessions:
+                    self._idle[mx_host] = sessions
+                return session
+            session.abort()
+
+        session = SMTPSession(mx_host)
+        await session.open()
+        return session
+
+    async def release(self, session: SMTPSession) -> None:
+        if not session.is_open or session.exhausted:
+            await session.close()
+            return
+        sessions = self._idle[session.mx_host]
+        if len(sessions) < settings.smtp_max_idle_sessions_per_host:
+            sessions.append(session)
+            return
+        await session.close()
+
+    async def rcpt(self, mx_host: str, email: str) -> int:
+        """Probe one recipient on `mx_host` over a pooled session."""
+        return (await self.rcpt_many(mx_host, [email]))[0]
+
+    async def rcpt_many(self, mx_host: str, emails: list[str]) -> list[int]:
+        """
+        Probe several recipients on `mx_host` in one pooled conversation.
+        Waits for a slot from the per-host/per-provider scheduler first.
+        A session dropped by the server while idle is reopened once.
+        """
+        async with smtp_scheduler.slot(mx_host, rcpts=len(emails)):
+            session = await self.acquire(mx_host)
+            codes = []
+            try:
+                for email in emails:
+                    if not session.is_open:
+                        raise SMTPDisconnected("Server closed the session")
+                    try:
+                        codes.append(await session.rcpt(email))
+                    except SMTPDisconnected:
+                        if codes:
+                            raise
+                        session.abort()
+                        await session.open()
+                        codes.append(await session.rcpt(email))
+            except BaseException:
+                # Errors, timeouts and cancellation leave the dialog in an unknown state
+                session.abort()
+                raise
+            await self.release(session)
+        return codes
+
+    async def close_all(self) -> None:
+        sessions = [s for host_sessions in self._idle.values() for s in host_sessions]
+        self._idle.clear()
+        for session in sessions:
+            await session.close()
+
+
+# 👇 shared pool for all SMTP-based checks in the process
+smtp_pool = SMTPSessionPool()
@@ -0,0 +1,146 @@
+# app/logic/smtp_scheduler.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from app.config import settings
+
+# MX host suffix -> provider group. Hosts of one provider share a budget,
+# since the provider throttles us as a whole, not per MX name.
+PROVIDER_GROUPS = {
+    "google.com": "google",
+    "googlemail.com": "google",
+    "outlook.com": "microsoft",
+    "hotmail.com": "microsoft",
+    "yahoodns.net": "yahoo",
+    "yahoo.com": "yahoo",
+    "icloud.com": "apple",
+    "zoho.com": "zoho",
+    "pphosted.com": "proofpoint",
+    "mimecast.com": "mimecast",
+    "messagelabs.com": "broadcom",
+}
+
+
+def provider_group(mx_host: str) -> str | None:
+    """Return the provider group of an MX host, or None if it has none."""
+    labels = mx_host.lower().rstrip(".").split(".")
+    for i in range(len(labels) - 1):
+        group = PROVIDER_GROUPS.get(".".join(labels[i:]))
+        if group:
+            return group
+    return None
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        tokens = min(tokens, self.capacity)
+        async with self._lock:  # waiters are served in FIFO order
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    @property
+    def full(self) -> bool:
+        """No one waiting and back at capacity: a fresh bucket would be the same."""
+        refilled = self.tokens + (time.monotonic() - self.updated) * self.rate
+        return not self._lock.locked() and refilled >= self.capacity
+
+
+class _Limit:
+    def __init__(self, max_concurrent: int, rate: float):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.bucket = TokenBucket(rate, capacity=max(1.0, rate))
+        self.users = 0  # probes holding or waiting for this limit
+
+    @property
+    def idle(self) -> bool:
+        return not self.users and self.bucket.full
+
+
+class SMTPScheduler:
+    """
+    Gate in front of SMTP probes: at most N concurrent connections and
+    R RCPTs per second per MX host, plus a wider budget per provider group.
+    Each host has its own limits, so a saturated host does not hold up others.
+    Limits nobody uses and whose bucket has refilled are dropped every
+    SWEEP_INTERVAL seconds, so the maps don't grow with every MX ever seen.
+    """
+
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self):
+        self._loop = None
+        self._hosts = {}
+        self._groups = {}
+        self._swept = time.monotonic()
+
+    def _sweep(self) -> None:
+        for limits in (self._hosts, self._groups):
+            for key in [key for key, limit in limits.items() if limit.idle]:
+                del limits[key]
+        self._swept = time.monotonic()
+
+    def _limits(self, mx_host: str) -> list[_Limit]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # asyncio primitives are bound to one loop
+            self._loop = loop
+            self._hosts.clear()
+            self._groups.clear()
+        elif time.monotonic() - self._swept > self.SWEEP_INTERVAL:
+            self._sweep()
+
+        host = mx_host.lower()
+        if host not in self._hosts:
+            self._hosts[host] = _Limit(settings.smtp_max_connections_per_host,
+                                       settings.smtp_rate_per_host)
+        limits = [self._hosts[host]]
+
+        group = provider_group(mx_host)
+        if group:
+            if group not in self._groups:
+                self._groups[group] = _Limit(settings.smtp_max_connections_per_group,
+                                             settings.smtp_rate_per_group)
+            limits.append(self._groups[group])
+        return limits
+
+    @asynccontextmanager
+    async def slot(self, mx_host: str, rcpts: int = 1):
+        """Hold one connection slot for `mx_host` and spend `rcpts` rate tokens."""
+        limits = self._limits(mx_host)
+        for limit in limits:
+            limit.users += 1
+        acquired = []
+        try:
+            # Host before group: probes queued on a saturated host don't hold
+            # group slots, and the fixed order rules out deadlocks
+            for limit in limits:
+                await limit.semaphore.acquire()
+                acquired.append(limit)
+            for limit in limits:
+                await limit.bucket.acquire(rcpts)
+            yield
+        finally:
+            for limit in acquired:
+                limit.semaphore.release()
+            for limit in limits:
+                limit.users -= 1
+
+
+# 👇 shared scheduler for all SMTP probes in the process
+smtp_scheduler = SMTPScheduler()
@@ -1,12 +1,12 @@
-import dns.resolver
+from app.core.dns_resolver import resolver
 
-def check_spf(email: str) -> bool:
+async def check_spf(email: str) -> bool:
     """Check if domain has SPF record"""
     try:
         domain = email.split("@")[1]
-        answers = dns.resolver.resolve(domain, "TXT")
+        answers = await resolver.resolve(domain, "TXT")
         for r in answers:
-            if "v=spf1" in str(r):
+            if "v=spf1" in r:
                 return True
         return False
     except Exception:
@@ -1,6 +1,7 @@
 import re
 
+SYNTAX_REGEX = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
+
 def check_syntax(email: str) -> bool:
     """Validate email syntax using regex"""
-    pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    return re.match(pattern, email) is not None
+    return re.match(SYNTAX_REGEX, email) is not None
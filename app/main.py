@@ -1,11 +1,12 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from app.routers import email_routes, auth, bulk_routes, dashboard_routes, multiple_routes, batch_routes, single_routes, contact_search, account_settings
+from app.routers import email_routes, auth, bulk_routes, dashboard_routes, multiple_routes, batch_routes, single_routes, contact_search, account_settings, job_routes
 from starlette.middleware.sessions import SessionMiddleware
 from itsdangerous import URLSafeSerializer
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, async_engine
+from app.migrations import run_migrations
 
 app = FastAPI(title="Email Validation System")
 
@@ -20,14 +21,16 @@ csrf_serializer = URLSafeSerializer(settings.secret_key, salt="csrf-token")
 # -----------------------------
 @app.on_event("startup")
 async def on_startup():
-    # Create all tables asynchronously
-    async with engine.begin() as conn:
+    # Create all tables asynchronously, then bring existing ones up to date
+    async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
     print("Server started.")
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
+    await async_engine.dispose()
     print("Server shutting down.")
 
 
@@ -41,6 +44,7 @@ app.include_router(batch_routes.router)
 app.include_router(single_routes.router)
 app.include_router(contact_search.router)
 app.include_router(account_settings.router)
+app.include_router(job_routes.router)
 
 # Homepage route
 @app.get("/", response_class=HTMLResponse)
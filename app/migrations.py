@@ -0,0 +1,34 @@
+# app/migrations.py
+from sqlalchemy import text
+
+# Schema changes create_all can't make on existing tables. Every step is
+# idempotent: it runs on each startup, after create_all.
+MIGRATIONS = [
+    # email_validations: unique per (email, user_id) instead of per email,
+    # the conflict target of the result upserts (app/crud/email_crud.py)
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'ix_email_validations_email' AND i.indisunique
+        ) THEN
+            DROP INDEX ix_email_validations_email;
+            CREATE INDEX ix_email_validations_email ON email_validations (email);
+        END IF;
+        ALTER TABLE email_validations DROP CONSTRAINT IF EXISTS email_validations_email_key;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'uq_email_validations_email_user'
+        ) THEN
+            ALTER TABLE email_validations
+                ADD CONSTRAINT uq_email_validations_email_user UNIQUE (email, user_id);
+        END IF;
+    END $$;
+    """,
+]
+
+
+def run_migrations(conn) -> None:
+    """Apply MIGRATIONS on a (sync) connection, e.g. through AsyncConnection.run_sync."""
+    for statement in MIGRATIONS:
+        conn.execute(text(statement))
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Index
+from app.database import Base
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class CreditLedger(Base):
+    """
+    Every change to a user's credit balance, with the balance it left.
+    Bulk jobs show up as one "reserve" at start and a "refund" per settled
+    chunk for the rows that were deduplicated, failed or never run.
+    """
+    __tablename__ = "credit_ledger"
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    job_id = Column(String(36), ForeignKey("validation_jobs.id", ondelete="SET NULL"), nullable=True)
+    kind = Column(String, nullable=False)               # charge | reserve | refund | credit
+    amount = Column(Integer, nullable=False)            # change to the balance (negative = spent)
+    balance = Column(Integer, nullable=False)           # balance after the change
+    created_at = Column(DateTime(timezone=True), default=_utcnow)
+
+    __table_args__ = (
+        Index("ix_credit_ledger_user_created", "user_id", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,7 +6,7 @@ class EmailValidation(Base):
     __tablename__ = "email_validations"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, index=True, nullable=False)
     valid_syntax = Column(Boolean, default=False)       # ✅ Boolean
     domain_exists = Column(Boolean, default=False)      # ✅ Boolean
     mx_exists = Column(Boolean, default=False)          # ✅ Boolean
@@ -15,4 +15,9 @@ class EmailValidation(Base):
     score = Column(Integer, default=0)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    user = relationship("User", backref="validations")
\ No newline at end of file
+    user = relationship("User", backref="validations")
+
+    __table_args__ = (
+        # One row per user and address; the target of the batched upserts
+        UniqueConstraint("email", "user_id", name="uq_email_validations_email_user"),
+    )
\ No newline at end of file
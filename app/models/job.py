@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, JSON, Index
+from app.database import Base
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class ValidationJob(Base):
+    """One bulk/batch validation run; results live in job_results, not in Celery."""
+    __tablename__ = "validation_jobs"
+
+    id = Column(String(36), primary_key=True)          # uuid4
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False)               # "bulk" | "batch"
+    status = Column(String, default="running")          # running | done | failed | cancelled
+    task_id = Column(String, nullable=True)             # Celery task whose state carries the progress
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    unique = Column(Integer, default=0)
+    counts = Column(JSON, default=dict)                 # {result status: rows}
+    credits_used = Column(Integer, default=0)
+    credits_reserved = Column(Integer, default=0)       # still held by unsettled chunks, plus credits_used
+    spool_path = Column(String, nullable=True)          # bulk input (see utils/email_reader.py)
+    created_at = Column(DateTime(timezone=True), default=_utcnow)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class JobChunk(Base):
+    """
+    Work unit and checkpoint of a job. Updated in the same transaction as
+    the job_results rows it covers, so a restarted chunk knows exactly which
+    rows are done and what they already cost.
+    """
+    __tablename__ = "job_chunks"
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), ForeignKey("validation_jobs.id", ondelete="CASCADE"), nullable=False)
+    chunk = Column(Integer, nullable=False)
+    first_row = Column(Integer, nullable=False)
+    rows = Column(Integer, nullable=False)
+    offset = Column(BigInteger, nullable=True)          # bulk: byte offset in the spool
+    emails = Column(JSON, nullable=True)                # batch: [[row, email], ...]
+    status = Column(String, default="pending")          # pending | queued | done | failed | cancelled
+    processed = Column(Integer, default=0)
+    unique = Column(Integer, default=0)
+    credits_used = Column(Integer, default=0)
+    credits_reserved = Column(Integer, default=0)       # taken at job start; settled down to credits_used
+    counts = Column(JSON, default=dict)
+    updated_at = Column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
+
+    __table_args__ = (
+        Index("ix_job_chunks_job_chunk", "job_id", "chunk", unique=True),
+    )
+
+
+class JobResult(Base):
+    """One input row of a job. `row` is its position in the input (the page key)."""
+    __tablename__ = "job_results"
+
+    id = Column(BigInteger, primary_key=True)
+    job_id = Column(String(36), ForeignKey("validation_jobs.id", ondelete="CASCADE"), nullable=False)
+    row = Column(Integer, nullable=False)
+    email = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    score = Column(Integer, default=0)
+    details = Column(JSON)
+
+    __table_args__ = (
+        # Keyset pagination: WHERE job_id = ? [AND status = ?] AND row > ? ORDER BY row
+        Index("ix_job_results_job_row", "job_id", "row", unique=True),
+        Index("ix_job_results_job_status_row", "job_id", "status", "row"),
+    )
@@ -4,11 +4,15 @@ from fastapi import (
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.email_validator import validate_email
+from app.database import get_db, async_session
+from app.services.email_validator import validate_email_once
+from app.services.result_writer import ResultWriter
 from app.csrf import validate_csrf_token
 import asyncio
 import json
+import os
+from app.config import settings
+from app.utils.email_reader import spool_upload, aiter_spooled
 
 router = APIRouter()
 
@@ -23,24 +27,36 @@ async def validate_batch_stream(
     if not validate_csrf_token(request, csrf_token):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
 
-    # Collect emails from all files
-    emails = []
-    for file in files:
-        contents = await file.read()
-        file_emails = [line.strip() for line in contents.decode().splitlines() if line.strip()]
-        emails.extend(file_emails)
-
-    total = len(emails)
+    # Stream every file to disk in chunks (never the whole upload in memory)
+    spooled = [await spool_upload(file, settings.bulk_chunk_size) for file in files]
+    total = sum(rows for _, index in spooled for _, rows in index)
     if total == 0:
+        for path, _ in spooled:
+            os.remove(path)
         return {"error": "No valid emails found in uploaded files."}
 
     async def event_stream():
-        for i, email in enumerate(emails, start=1):
-            result = await validate_email(email, db, user_id=1, deep=True)
-            data = {"progress": int((i / total) * 100), "result": result}
-            yield f"data: {json.dumps(data)}\n\n"
-            await asyncio.sleep(0.2)
+        seen = {}  # canonical mailbox -> result: duplicates/aliases are validated once
+        i = 0
+        try:
+            # Result rows are saved in batches, not one transaction per address
+            async with ResultWriter(async_session) as writer:
+                for path, index in spooled:
+                    # Next chunk is read only when the previous one is validated
+                    async for chunk in aiter_spooled(path, index):
+                        for email in chunk:
+                            i += 1
+                            result = await validate_email_once(email, db, user_id=1, seen=seen,
+                                                               deep=True, writer=writer)
+                            data = {"progress": int((i / total) * 100), "result": result}
+                            yield f"data: {json.dumps(data)}\n\n"
+                            await asyncio.sleep(0.2)
+        finally:
+            for path, _ in spooled:
+                os.remove(path)
 
+        summary = {"unique": len(seen), "dedup_saved": total - len(seen)}
+        yield f"data: {json.dumps(summary)}\n\n"
         yield "data: [DONE]\n\n"
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
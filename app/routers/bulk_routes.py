@@ -1,45 +1,39 @@
+import os
 import uuid
 import asyncio
 import json
-import csv
-from io import StringIO
-from typing import List
 
 from fastapi import APIRouter, UploadFile, File, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.services.email_validator import validate_email
+from app.database import get_db, async_session
+from app.services.email_validator import validate_email_once
+from app.services.result_writer import ResultWriter
+from app.core.deadline import Deadline
+from app.config import settings
+from app.utils.email_reader import spool_upload, aiter_spooled
 
 router = APIRouter()
 
-# In-memory task store { session_id: [emails] }
+# In-memory task store { session_id: (spool path, chunk index) }
 bulk_sessions = {}
 
 @router.post("/email/validate/bulk/start")
 async def start_bulk_validation(file: UploadFile = File(...)):
     """
-    Accepts bulk email file (.txt or .csv) and returns a session_id for WebSocket progress tracking.
+    Accepts bulk email file (.txt or .csv, optionally .gz) and returns a session_id for WebSocket progress tracking.
+    The upload is streamed to disk in chunks, never held in memory as a whole.
     """
-    content = await file.read()
-    text = content.decode("utf-8")
-
-    # Extract emails (handle CSV or plain text)
-    emails: List[str] = []
-    if file.filename.endswith(".csv"):
-        reader = csv.reader(StringIO(text))
-        for row in reader:
-            if row:  # pick first column
-                emails.append(row[0].strip())
-    else:
-        emails = [line.strip() for line in text.splitlines() if line.strip()]
-
-    if not emails:
+    path, index = await spool_upload(file, settings.bulk_chunk_size)
+    count = sum(rows for _, rows in index)
+
+    if not count:
+        os.remove(path)
         return {"error": "No emails found in file."}
 
     session_id = str(uuid.uuid4())
-    bulk_sessions[session_id] = emails
-    return {"session_id": session_id, "count": len(emails)}
+    bulk_sessions[session_id] = (path, index)
+    return {"session_id": session_id, "count": count}
 
 
 @router.websocket("/ws/validation/progress/{session_id}")
@@ -51,26 +45,39 @@ async def bulk_validation_progress(websocket: WebSocket, session_id: str, db: Se
         await websocket.close()
         return
 
-    emails = bulk_sessions.pop(session_id)  # remove after use
-    total = len(emails)
+    path, index = bulk_sessions.pop(session_id)  # remove after use
+    total = sum(rows for _, rows in index)
+    seen = {}  # canonical mailbox -> result: duplicates/aliases are validated once
 
     try:
-        for i, email in enumerate(emails, start=1):
-            # Run full validation (fresh, no cache)
-            result = await validate_email(email, db, user_id=1, deep=True)
-
-            percent = int((i / total) * 100)
-            await websocket.send_text(json.dumps({
-                "percent": percent,
-                "result": result
-            }))
-
-            await asyncio.sleep(0.1)  # small delay to avoid flooding
+        i = 0
+        # Result rows are saved in batches, not one transaction per address
+        async with ResultWriter(async_session) as writer:
+            # One chunk in memory at a time; the next is read once this one is done
+            async for chunk in aiter_spooled(path, index):
+                for email in chunk:
+                    i += 1
+                    # Run full validation (once per mailbox)
+                    result = await validate_email_once(email, db, user_id=1, seen=seen, deep=True,
+                                                       deadline=Deadline(), writer=writer)
+
+                    percent = int((i / total) * 100)
+                    await websocket.send_text(json.dumps({
+                        "percent": percent,
+                        "result": result
+                    }))
+
+                    await asyncio.sleep(0.1)  # small delay to avoid flooding
 
         # Done
-        await websocket.send_text(json.dumps({"done": True}))
+        await websocket.send_text(json.dumps({
+            "done": True,
+            "unique": len(seen),
+            "dedup_saved": total - len(seen)
+        }))
 
     except WebSocketDisconnect:
         print(f"WebSocket disconnected: {session_id}")
     finally:
+        os.remove(path)
         await websocket.close()
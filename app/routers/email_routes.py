@@ -15,6 +15,10 @@ from app.dependencies import get_current_user
 from app.services.email_validator import validate_email
 from app.utils.sse import push_progress
 from app.core.websocket_manager import manager
+from app.celery_worker import celery_app
+from app.core.deadline import Deadline
+from app.config import settings
+from app.utils.email_reader import spool_upload
 import json
 import asyncio
 from app.tasks.email_tasks import validate_single_email, validate_multiple_emails, validate_bulk_emails, validate_batch_emails
@@ -103,7 +107,8 @@ async def validate_single(
     email: str = Form(...),
     current_user: User = Depends(get_current_user),
 ):
-    task = validate_single_email.delay(email, current_user.id)
+    # The deadline starts now, so time spent queued counts against it
+    task = validate_single_email.delay(email, current_user.id, Deadline().timestamp())
     return {"message": "Validation started", "task_id": task.id}
 
 
@@ -113,12 +118,13 @@ async def validate_bulk(
     file: UploadFile,
     current_user: User = Depends(get_current_user)
 ):
-    emails = [line.decode("utf-8").strip() for line in file.file.readlines() if line.strip()]
-    task = bulk_validate_emails.delay(emails, current_user.id)
+    # Stream the upload into the job's spool; chunk tasks read it back by index
+    path, index = await spool_upload(file, settings.bulk_chunk_size)
+    task = validate_bulk_emails.delay(path, index, current_user.id)
     return {"message": "Bulk validation started", "task_id": task.id}
 
 
-# ✅ Task status check
+# ✅ Task status check (bulk/batch results are paged from /jobs/{job_id}/results)
 @router.get("/tasks/{task_id}")
 async def get_task_status(task_id: str):
     task = celery_app.AsyncResult(task_id)
@@ -128,4 +134,7 @@ async def get_task_status(task_id: str):
         return {"status": "success", "result": task.result}
     elif task.state == "FAILURE":
         return {"status": "failure", "error": str(task.info)}
+    elif task.state == "PROGRESS":
+        # Bulk/batch jobs: processed, valid/invalid, rate (addresses/s), eta (s)
+        return {"status": "progress", "progress": task.info}
     return {"status": task.state}
\ No newline at end of file
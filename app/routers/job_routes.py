@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.crud.job_crud import get_job, get_job_results, cancel_job, job_is_stalled
+from app.tasks.email_tasks import resume_job, settle_job
+
+router = APIRouter()
+
+
+@router.get("/jobs/{job_id}")
+async def job_summary(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Status and counts of a bulk/batch job.
+    """
+    job = await get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "task_id": job.task_id,  # GET /tasks/{task_id} shows live progress
+        "total": job.total,
+        "processed": job.processed,
+        "unique": job.unique,
+        "counts": job.counts,
+        "credits_used": job.credits_used,
+        "credits_reserved": job.credits_reserved,  # settled down to credits_used per chunk
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+@router.get("/jobs/{job_id}/results")
+async def job_results(
+    job_id: str,
+    after: int = Query(-1, description="Last row of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    status: str | None = Query(None, description="Only rows with this status (e.g. valid)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    One page of a job's results, in input order.
+    Keyset pagination: pass the returned `next_after` as `after` for the next page.
+    """
+    job = await get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    rows = await get_job_results(db, job_id, after=after, limit=limit, status=status)
+    return {
+        "job_id": job_id,
+        "results": [
+            {"row": r.row, "email": r.email, "status": r.status, "score": r.score, "details": r.details}
+            for r in rows
+        ],
+        "next_after": rows[-1].row if len(rows) == limit else None,
+    }
+
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_job_route(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Restart a failed, cancelled or stalled job from its chunk checkpoints.
+    Rows already validated are neither re-validated nor billed again;
+    credits for the remaining rows are reserved again. A running job is
+    only resumed once a chunk has stopped checkpointing (its worker died),
+    so no chunk is ever run twice at once.
+    """
+    job = await get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "done":
+        raise HTTPException(status_code=400, detail="Job already finished")
+    if job.status == "running" and not await job_is_stalled(db, job_id):
+        raise HTTPException(status_code=400, detail="Job is still running")
+
+    task = resume_job.delay(job_id)
+    return {"message": "Job resumed", "job_id": job_id, "task_id": task.id}
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job_route(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stop a running job. Chunks not started yet are dropped and running ones
+    stop at their next checkpoint; the credits reserved for the rows left
+    undone are refunded as the chunks settle.
+    Results so far stay readable; /jobs/{job_id}/resume picks it up again.
+    """
+    job = await get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not await cancel_job(db, job_id):
+        raise HTTPException(status_code=400, detail=f"Job is already {job.status}")
+
+    settle_job.delay(job_id)
+    return {"message": "Job cancelled", "job_id": job_id}
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.database import async_session
 from app.services.email_validator import validate_email
+from app.services.result_writer import ResultWriter
+from app.core.deadline import Deadline
 import asyncio
 
 router = APIRouter()
@@ -24,9 +26,11 @@ async def websocket_multiple_email(websocket: WebSocket):
         total = len(email_list)
 
         # Use async_session factory from database.py
-        async with async_session() as db:
+        async with async_session() as db, ResultWriter(async_session) as writer:
             for i, email in enumerate(email_list, start=1):
-                result = await validate_email(email=email, db=db, user_id=user_id, deep=True)
+                # Each address gets its own budget so one slow domain can't stall the stream
+                result = await validate_email(email=email, db=db, user_id=user_id, deep=True,
+                                              deadline=Deadline(), writer=writer)
 
                 # Send progress update
                 await websocket.send_json({
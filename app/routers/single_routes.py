@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.templating import Jinja2Templates
 from app.database import get_db
 from app.services.email_validator import validate_email
+from app.core.deadline import Deadline
 from app.dependencies import get_current_user
 from app.models.user import User
 from app.csrf import generate_csrf_token, validate_csrf_token
@@ -42,7 +43,10 @@ async def validate_single_email_route(
     """
     Validate a single email synchronously and render results in HTML.
     Deducts 1 credit inside validate_email.
+    Checks share a request deadline, so a slow domain can't hold the page.
     """
+    deadline = Deadline()
+
     # ✅ CSRF validation
     if not validate_csrf_token(request, csrf_token):
         raise HTTPException(status_code=400, detail="Invalid CSRF token")
@@ -56,7 +60,8 @@ async def validate_single_email_route(
         email=email,
         db=db,
         user_id=current_user.id,
-        deep=True
+        deep=True,
+        deadline=deadline
     )
 
     # ✅ Generate a new CSRF token for the next form submission
@@ -0,0 +1,168 @@
+# app/services/domain_expiry.py
+import asyncio
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.utils.public_suffix import public_suffix, registrable_domain
+
+# Field names registries/registrars use for the expiry date
+_EXPIRY_RE = re.compile(
+    r"^\s*(?:registry expiry date|registrar registration expiration date|expiration date|"
+    r"expiry date|expiration time|expire date|expires on|expires|paid-till|renewal date)"
+    r"\s*:\s*(.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_REFER_RE = re.compile(r"^\s*(?:refer|whois|registrar whois server)\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_DATE_FORMATS = ("%Y-%m-%d", "%d-%b-%Y", "%Y.%m.%d", "%Y/%m/%d", "%d.%m.%Y", "%d/%m/%Y", "%Y%m%d")
+
+
+def parse_expiry(text: str) -> datetime | None:
+    """Extract the first parseable expiry date from a WHOIS response."""
+    for match in _EXPIRY_RE.finditer(text):
+        value = match.group(1).strip()
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            parsed = None
+            head = value.split()[0].split("T")[0]
+            for fmt in _DATE_FORMATS:
+                try:
+                    parsed = datetime.strptime(head, fmt)
+                    break
+                except ValueError:
+                    continue
+        if parsed is not None:
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+def whois_query(server: str, query: str, port: int = 43, timeout: float = 5.0) -> str:
+    """Raw WHOIS (RFC 3912): send the query line, read until the server closes."""
+    chunks = []
+    deadline = time.monotonic() + timeout
+    with socket.create_connection((server, port), timeout=timeout) as sock:
+        sock.sendall(f"{query}\r\n".encode())
+        while time.monotonic() < deadline:
+            data = sock.recv(4096)
+            if not data:
+                break
+            chunks.append(data)
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+class DomainExpiryService:
+    """
+    Domain expiry lookups over WHOIS:
+      - normalizes to the registrable domain (bundled public suffix list)
+      - caches expiry dates until `whois_refresh_margin` before they expire
+      - runs blocking lookups in a bounded thread pool with a hard timeout
+      - deduplicates concurrent lookups of the same domain
+
+    Lookups start at `whois_server:whois_port` (IANA by default) and follow
+    one referral, so pointing them at a local fake responder is just a
+    settings change.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.whois_max_workers, thread_name_prefix="whois"
+        )
+        self._cache: OrderedDict = OrderedDict()  # domain -> (cache_until, expiry)
+        self._referrals = {}                      # public suffix -> registry whois server
+        self._lock = threading.Lock()
+        self._inflight = {}                       # (loop, domain) -> Future
+
+    # -----------------------------
+    # Cache helpers
+    # -----------------------------
+    def _cached(self, domain: str):
+        with self._lock:
+            entry = self._cache.get(domain)
+            if entry is None:
+                return False, None
+            cache_until, expiry = entry
+            if cache_until < time.time():
+                del self._cache[domain]
+                return False, None
+            self._cache.move_to_end(domain)
+            return True, expiry
+
+    def _store(self, domain: str, expiry: datetime | None) -> None:
+        now = time.time()
+        if expiry is None:
+            cache_until = now + settings.whois_negative_ttl
+        else:
+            # Keep the date until shortly before it could change (renewal/expiry)
+            refresh_at = expiry.timestamp() - settings.whois_refresh_margin
+            cache_until = max(refresh_at, now + settings.whois_negative_ttl)
+        with self._lock:
+            self._cache[domain] = (cache_until, expiry)
+            self._cache.move_to_end(domain)
+            while len(self._cache) > settings.whois_cache_size:
+                self._cache.popitem(last=False)
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def _lookup(self, domain: str) -> datetime | None:
+        """Blocking WHOIS lookup; runs on the thread pool."""
+        timeout = settings.whois_timeout
+        suffix = public_suffix(domain)
+        server = self._referrals.get(suffix)
+        if server is None:
+            text = whois_query(settings.whois_server, domain, settings.whois_port, timeout)
+            expiry = parse_expiry(text)
+            refer = _REFER_RE.search(text)
+            if expiry is not None or refer is None:
+                return expiry
+            server = refer.group(1).rstrip(".")
+            self._referrals[suffix] = server
+
+        return parse_expiry(whois_query(server, domain, 43, timeout))
+
+    async def get_expiry(self, domain: str) -> datetime | None:
+        """
+        Expiry date of the domain's registration, or None if unknown.
+        The lookup runs on its own: a caller that stops waiting (deadline,
+        cancellation) doesn't abort it, so the answer is still cached and
+        handed to the other waiters.
+        """
+        domain = registrable_domain(domain)
+        hit, expiry = self._cached(domain)
+        if hit:
+            return expiry
+
+        loop = asyncio.get_running_loop()
+        key = (loop, domain)
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._inflight[key] = future
+            lookup = asyncio.ensure_future(asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._lookup, domain),
+                settings.whois_timeout,
+            ))
+            lookup.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key, lookup: asyncio.Future) -> None:
+        """Done-callback of a lookup: cache the answer and wake every waiter."""
+        _, domain = key
+        if lookup.cancelled() or lookup.exception() is not None:
+            expiry = None  # timeouts/unreachable servers are cached briefly too
+        else:
+            expiry = lookup.result()
+        self._store(domain, expiry)
+        future = self._inflight.pop(key)
+        if not future.done():
+            future.set_result(expiry)
+
+
+# 👇 shared service (cache + thread pool) for the process
+domain_expiry_service = DomainExpiryService()
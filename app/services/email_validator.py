@@ -1,134 +1,87 @@
 import re
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.celery_worker import celery_app
+from app.config import settings
 from app.crud.email_crud import save_validation_result
-from app.logic.mx_check import check_mx_record
-from app.logic.dns_check import check_dns_record
-from app.logic.dkim_check import check_dkim
-from app.logic.spf_check import check_spf
-from app.logic.smtp_check import check_smtp
-from app.logic.blacklist_check import check_blacklist
-from app.logic.freemail_check import check_freemail
-from app.logic.role_check import check_role
+from app.logic.pipeline import pipeline, compute_score, compute_status
+from app.logic.smtp_check import PENDING
+from app.logic.syntax_check import SYNTAX_REGEX
+from app.logic.domain_facts import collect_domain_facts
+from app.logic.dedup import canonical_email
 from app.utils.credits import deduct_credit   # ✅ Import credit utility
+from app.core.deadline import Deadline
+from app.core.executor import bounded_map
+from app.services.result_writer import ResultWriter
 
 
-# Scoring weights
-WEIGHTS = {
-    "syntax": 20,
-    "mx": 20,
-    "spf": 10,
-    "dkim": 10,
-    "blacklist": 20,
-    "catchall": -10,
-    "role": -5,
-    "free": -5,
-    "smtp": 20,
-}
-
-
-def categorize_email(score: int) -> str:
-    if score >= 70:
-        return "valid"
-    elif score >= 40:
-        return "possibly valid"
-    elif score >= 20:
-        return "risky"
-    return "invalid"
+def schedule_greylist_reprobe(email: str, user_id: int, attempt: int = 1) -> None:
+    """Queue a later re-probe of a greylisted address (see reprobe_greylisted task)."""
+    celery_app.send_task(
+        "app.tasks.email_tasks.reprobe_greylisted",
+        args=[email, user_id, attempt],
+        countdown=settings.greylist_retry_delay,
+    )
 
 
-async def validate_email(email: str, db: AsyncSession, user_id: int, deep: bool = True) -> dict:
+async def validate_email(email: str, db: AsyncSession, user_id: int, deep: bool = True,
+                         domain_facts: dict | None = None, deadline: Deadline | None = None,
+                         charge: bool = True, writer: ResultWriter | None = None) -> dict:
     """
     Validate a single email with scoring + category.
-    Deducts 1 credit before validation.
+    Deducts 1 credit before validation (unless `charge` is False).
+    Pass `domain_facts` (from collect_domain_facts) to skip the per-domain checks.
+    Pass a `deadline` to bound the checks; those that run out of time are unknown.
+    Pass a `writer` to batch the result row with others instead of saving it here.
+    All checks run through the shared pipeline in app/logic/pipeline.py.
     """
     # 🔑 Step 0 — Deduct credit (fail fast if no balance)
-    await deduct_credit(db, user_id, amount=1)
+    if charge:
+        await deduct_credit(db, user_id, amount=1)
+
+    # 1️⃣ Run the check DAG (domain facts, if given, are not re-checked)
+    results = await pipeline.run(email, deep=deep, known=domain_facts, deadline=deadline)
 
-    score = 0
+    # 2️⃣ Score + category/status (greylisted → pending until re-probed)
+    score = compute_score(results)
+    status = compute_status(results, score)
+
+    # blacklist/role/free are reported as "passed" flags (✅ = not flagged)
     details = {
-        "syntax": False,
-        "mx": None,
-        "catchall": None,
-        "spf": None,
-        "dkim": None,
-        "smtp": None,
-        "blacklist": None,
-        "role": None,
-        "free": None,
+        "syntax": bool(results.get("syntax")),
+        "mx": results.get("mx"),
+        "catchall": results.get("catchall"),
+        "spf": results.get("spf"),
+        "dkim": results.get("dkim"),
+        "dmarc": results.get("dmarc"),
+        "smtp": results.get("smtp"),
+        "blacklist": None if results.get("blacklist") is None else not results["blacklist"],
+        "role": None if results.get("role") is None else not results["role"],
+        "free": None if results.get("free") is None else not results["free"],
+        "alias_forward": results.get("alias_forward"),
+        "domain_active": results.get("domain_active"),
     }
 
-    # 1️⃣ Syntax check
-    syntax_regex = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
-    syntax_ok = bool(re.match(syntax_regex, email))
-    details["syntax"] = syntax_ok
-    if syntax_ok:
-        score += WEIGHTS.get("syntax", 0)
-
-    if deep and syntax_ok:
-        # 2️⃣ MX record check
-        mx_ok = await check_mx_record(email)
-        details["mx"] = mx_ok
-        if mx_ok:
-            score += WEIGHTS.get("mx", 0)
-
-        # 3️⃣ DNS / catch-all check
-        catchall_ok = await check_dns_record(email)
-        details["catchall"] = catchall_ok
-        if catchall_ok:
-            score += WEIGHTS.get("catchall", 0)
-
-        # 4️⃣ SPF
-        spf_ok = check_spf(email)
-        details["spf"] = spf_ok
-        if spf_ok:
-            score += WEIGHTS.get("spf", 0)
-
-        # 5️⃣ DKIM
-        dkim_ok = check_dkim(email)
-        details["dkim"] = dkim_ok
-        if dkim_ok:
-            score += WEIGHTS.get("dkim", 0)
-
-        # 6️⃣ SMTP
-        smtp_ok = check_smtp(email)
-        details["smtp"] = smtp_ok
-        if smtp_ok:
-            score += WEIGHTS.get("smtp", 0)
-
-        # 7️⃣ Blacklist
-        blacklist_ok = not check_blacklist(email)
-        details["blacklist"] = blacklist_ok
-        if blacklist_ok:
-            score += WEIGHTS.get("blacklist", 0)
-
-        # 8️⃣ Role-based
-        role_ok = not check_role(email)
-        details["role"] = role_ok
-        if role_ok:
-            score += WEIGHTS.get("role", 0)
-
-        # 9️⃣ Free email
-        free_ok = not check_freemail(email)
-        details["free"] = free_ok
-        if free_ok:
-            score += WEIGHTS.get("free", 0)
-
-    # 🔟 Compute category/status
-    status = categorize_email(score)
-
-    # ✅ Save result to DB
-    await save_validation_result(
-        db=db,
-        email=email,
-        valid_syntax=details["syntax"],
-        domain_exists=details["catchall"],
-        mx_exists=details["mx"],
-        smtp_ok=details["smtp"],
-        status=status,
-        score=score,
-        user_id=user_id,
-    )
+    # ✅ Save result to DB (buffered if a writer is given)
+    row = {
+        "email": email,
+        "valid_syntax": details["syntax"],
+        "domain_exists": details["mx"],
+        "mx_exists": details["mx"],
+        "smtp_ok": details["smtp"] if details["smtp"] != PENDING else False,
+        "status": status,
+        "score": score,
+        "user_id": user_id,
+    }
+    if writer is not None:
+        await writer.add(row)
+    else:
+        await save_validation_result(db=db, **row)
+
+    if status == PENDING:
+        # Publishing to the broker is blocking I/O: keep it off the event loop
+        await run_in_threadpool(schedule_greylist_reprobe, email, user_id)
 
     # ✅ Return for API/template
     return {
@@ -138,3 +91,151 @@ async def validate_email(email: str, db: AsyncSession, user_id: int, deep: bool
         "category": status,
         "details": details,
     }
+
+
+def mailbox_facts(report: dict) -> dict:
+    """
+    Raw results behind a validate_email report, except the local-part
+    checks (syntax, role, alias_forward). Passed as `domain_facts` they let
+    another address of the same mailbox skip every lookup.
+    """
+    details = report["details"]
+    flag = lambda passed: None if passed is None else not passed  # undo the "passed" inversion
+    return {
+        "mx": details["mx"],
+        "spf": details["spf"],
+        "dkim": details["dkim"],
+        "dmarc": details["dmarc"],
+        "smtp": details["smtp"],
+        "catchall": details["catchall"],
+        "domain_active": details["domain_active"],
+        "blacklist": flag(details["blacklist"]),
+        "free": flag(details["free"]),
+    }
+
+
+async def _fan_out(email: str, report: dict, db: AsyncSession, user_id: int, deep: bool,
+                   writer: ResultWriter | None = None) -> dict:
+    """Result for another row of an already validated mailbox: no lookups, no credit."""
+    if email == report["email"]:
+        return dict(report)
+    return await validate_email(email, db, user_id, deep=deep,
+                                domain_facts=mailbox_facts(report), charge=False, writer=writer)
+
+
+async def validate_email_once(email: str, db: AsyncSession, user_id: int, seen: dict,
+                              deep: bool = True, deadline: Deadline | None = None,
+                              writer: ResultWriter | None = None) -> dict:
+    """
+    validate_email for row-by-row streams: `seen` maps canonical mailbox
+    keys to reports, so a duplicate or alias of an earlier row reuses its
+    result instead of being looked up and billed again.
+    """
+    key = canonical_email(email)
+    if key in seen:
+        return await _fan_out(email, seen[key], db, user_id, deep, writer=writer)
+    seen[key] = await validate_email(email, db, user_id, deep=deep, deadline=deadline, writer=writer)
+    return seen[key]
+
+
+async def _with_session(session_factory, func, *args, **kwargs):
+    """Run `func` with its own session: AsyncSessions can't be shared by concurrent tasks."""
+    async with session_factory() as db:
+        return await func(*args, db=db, **kwargs)
+
+
+async def iter_validate_emails(emails: list[str], session_factory, user_id: int,
+                               deep: bool = True, facts_cache: dict | None = None,
+                               seen: dict | None = None, concurrency: int | None = None,
+                               charge: bool = True):
+    """
+    Validate a list of emails, yielding (row index, report) as results
+    complete (not in input order). Domain-level facts are computed once per
+    domain; only the mailbox-specific checks run per address.
+
+    Rows are deduplicated by canonical mailbox (see app/logic/dedup.py):
+    each mailbox is validated and billed once, other rows get its result.
+    Pass the same `facts_cache` / `seen` dicts across batches to reuse facts
+    and mailbox results between them; len(emails) - len(seen) is the number
+    of lookups dedup saved.
+
+    At most `concurrency` (default settings.validation_concurrency)
+    validations are in flight, each with its own session from `session_factory`.
+    Result rows are saved in batches by a ResultWriter, flushed before the
+    generator finishes (or is closed). With `charge` False nothing is billed
+    per address: the caller reserved the credits and settles them from `seen`.
+    """
+    limit = concurrency or settings.validation_concurrency
+    facts_cache = {} if facts_cache is None else facts_cache
+    seen = {} if seen is None else seen
+
+    # First row of every mailbox not validated yet
+    firsts = {}
+    for index, email in enumerate(emails):
+        key = canonical_email(email)
+        if key not in seen:
+            firsts.setdefault(key, index)
+
+    if deep:
+        # One representative address per domain not seen yet
+        pending = {}
+        for index in firsts.values():
+            email = emails[index]
+            if re.match(SYNTAX_REGEX, email):
+                domain = email.split("@")[1].lower()
+                if domain not in facts_cache:
+                    pending.setdefault(domain, email)
+
+        async for domain, facts in bounded_map(
+            lambda domain: collect_domain_facts(pending[domain]), pending, limit
+        ):
+            facts_cache[domain] = facts
+
+    async with ResultWriter(session_factory) as writer:
+        def validate_first(key):
+            email = emails[firsts[key]]
+            return _with_session(
+                session_factory, validate_email, email, user_id=user_id, deep=deep,
+                domain_facts=facts_cache.get(email.split("@")[-1].lower()), charge=charge,
+                writer=writer,
+            )
+
+        async for key, report in bounded_map(validate_first, firsts, limit):
+            seen[key] = report
+            yield firsts[key], report
+
+        # Fan the mailbox results back out to the other rows: exact repeats
+        # get a copy, aliases re-run only their local-part checks
+        first_rows = set(firsts.values())
+
+        def mailbox_report(index):
+            return seen[canonical_email(emails[index])]
+
+        for index, email in enumerate(emails):
+            if index not in first_rows and email == mailbox_report(index)["email"]:
+                yield index, dict(mailbox_report(index))
+
+        aliases = (
+            index for index, email in enumerate(emails)
+            if index not in first_rows and email != mailbox_report(index)["email"]
+        )
+
+        def fan_out(index):
+            return _with_session(session_factory, _fan_out, emails[index], mailbox_report(index),
+                                 user_id=user_id, deep=deep, writer=writer)
+
+        async for index, report in bounded_map(fan_out, aliases, limit):
+            yield index, report
+
+
+async def validate_emails_by_domain(emails: list[str], session_factory, user_id: int,
+                                    deep: bool = True, facts_cache: dict | None = None,
+                                    seen: dict | None = None, charge: bool = True) -> list[dict]:
+    """iter_validate_emails, collected back into input order."""
+    results = [None] * len(emails)
+    async for index, report in iter_validate_emails(
+        emails, session_factory, user_id, deep=deep, facts_cache=facts_cache, seen=seen,
+        charge=charge,
+    ):
+        results[index] = report
+    return results
@@ -0,0 +1,97 @@
+# app/services/job_scheduler.py
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job import ValidationJob, JobChunk
+
+# Arbitrary key of the Postgres advisory lock serializing dispatch rounds
+_DISPATCH_LOCK = 0x656D7362
+
+
+def _next_pending_chunk(db: Session, user_id: int) -> JobChunk | None:
+    """Oldest running job of the user first, chunks in order."""
+    return (
+        db.query(JobChunk)
+        .join(ValidationJob, ValidationJob.id == JobChunk.job_id)
+        .filter(ValidationJob.user_id == user_id,
+                ValidationJob.status == "running",
+                JobChunk.status == "pending")
+        .order_by(ValidationJob.created_at, JobChunk.chunk)
+        .first()
+    )
+
+
+def dispatch_chunks(db: Session) -> list[tuple[str, int, int]]:
+    """
+    Fair-share dispatch of bulk chunks: pick which pending chunks may be
+    queued now, mark them "queued" and return them as (job_id, chunk, user_id).
+
+    Chunks are not all put on the bulk queue up front (a 1M-row job would
+    sit in front of everyone else's). Instead at most bulk_max_inflight_chunks
+    are queued at a time, no user gets more than bulk_max_chunks_per_user of
+    them, and each free slot goes to the user with the fewest chunks in
+    flight. Called when a job starts and whenever a chunk finishes.
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _DISPATCH_LOCK})
+
+    inflight = dict(
+        db.query(ValidationJob.user_id, func.count(JobChunk.id))
+        .join(JobChunk, JobChunk.job_id == ValidationJob.id)
+        .filter(JobChunk.status == "queued")
+        .group_by(ValidationJob.user_id)
+        .all()
+    )
+    waiting = {
+        user_id for (user_id,) in
+        db.query(ValidationJob.user_id)
+        .join(JobChunk, JobChunk.job_id == ValidationJob.id)
+        .filter(ValidationJob.status == "running", JobChunk.status == "pending")
+        .distinct()
+    }
+
+    free = settings.bulk_max_inflight_chunks - sum(inflight.values())
+    picked = []
+    while free > 0 and waiting:
+        user_id = min(waiting, key=lambda u: inflight.get(u, 0))
+        if inflight.get(user_id, 0) >= settings.bulk_max_chunks_per_user:
+            break  # the least busy user is at its cap, so everyone is
+        chunk = _next_pending_chunk(db, user_id)
+        if chunk is None:
+            waiting.discard(user_id)
+            continue
+        chunk.status = "queued"
+        inflight[user_id] = inflight.get(user_id, 0) + 1
+        free -= 1
+        picked.append((chunk.job_id, chunk.chunk, user_id))
+
+    db.commit()  # also releases the advisory lock
+    return picked
+
+
+def close_job_if_complete(db: Session, job_id: str) -> str | None:
+    """
+    Final status of the job ("done", or "failed" if a chunk gave up) once its
+    last chunk has settled, else None. The job leaves "running" through a
+    conditional UPDATE, so of concurrent callers only one gets the status.
+    """
+    open_chunks = (
+        db.query(func.count(JobChunk.id))
+        .filter(JobChunk.job_id == job_id, JobChunk.status.in_(("pending", "queued")))
+        .scalar()
+    )
+    if open_chunks:
+        return None
+    failed = (
+        db.query(JobChunk.id)
+        .filter(JobChunk.job_id == job_id, JobChunk.status == "failed")
+        .first()
+    )
+    status = "failed" if failed else "done"
+    won = (
+        db.query(ValidationJob)
+        .filter(ValidationJob.id == job_id, ValidationJob.status == "running")
+        .update({"status": status}, synchronize_session=False)
+    )
+    db.commit()
+    return status if won else None
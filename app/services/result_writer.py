@@ -0,0 +1,66 @@
+# app/services/result_writer.py
+import asyncio
+
+from app.config import settings
+from app.crud.email_crud import upsert_validation_results
+
+
+class ResultWriter:
+    """
+    Buffers EmailValidation rows and saves them with one multi-row
+    INSERT ... ON CONFLICT (email, user_id) DO UPDATE per batch, instead of
+    a SELECT, commit and refresh per address.
+
+    A batch is flushed once it holds `flush_rows` rows or its oldest row is
+    `flush_ms` old, whichever comes first, and on close. A later row for the
+    same (email, user_id) replaces the buffered one. Flushes run one at a
+    time, each with its own session from `session_factory`.
+
+        async with ResultWriter(session_factory) as writer:
+            await writer.add(row)
+    """
+
+    def __init__(self, session_factory, flush_rows: int | None = None, flush_ms: int | None = None):
+        self._session_factory = session_factory
+        self.flush_rows = flush_rows or settings.result_flush_rows
+        self.flush_interval = (flush_ms or settings.result_flush_ms) / 1000
+        self._rows: dict[tuple[str, int], dict] = {}
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def add(self, row: dict) -> None:
+        self._rows[(row["email"], row["user_id"])] = row
+        if len(self._rows) >= self.flush_rows:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_later)
+
+    def _flush_later(self) -> None:
+        self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._rows:
+            return
+        rows, self._rows = list(self._rows.values()), {}
+        async with self._lock:  # FIFO: batches land in the order they were cut
+            async with self._session_factory() as db:
+                await upsert_validation_results(db, rows)
+                await db.commit()
+
+    async def close(self) -> None:
+        """Flush what is buffered and wait for timer flushes (re-raising their errors)."""
+        await self.flush()
+        await asyncio.gather(*self._flushes)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
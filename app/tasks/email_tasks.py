@@ -1,43 +1,73 @@
 # app/tasks/email_tasks.py
-import asyncio
+import os
+from contextlib import aclosing
 from sqlalchemy.orm import Session
 from app.services.email_validator import validate_email
 from app.database import SessionLocal
 from app.models.user import User
 from app.celery_worker import celery_app
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.utils.credits import deduct_credit, deduct_credit_sync
+from app.utils.credits import get_credits_sync, reserve_credits_sync, release_credits_sync
 from celery import shared_task
-from app.services.email_validator import validate_email  # async function
+from celery.exceptions import Ignore
+from app.services.email_validator import validate_email, validate_emails_by_domain  # async functions
+from app.services.email_validator import iter_validate_emails
+from app.services.email_validator import schedule_greylist_reprobe
+from app.logic.pipeline import WEIGHTS, categorize_email
+from app.logic.smtp_check import check_smtp, PENDING
+from app.models.email import EmailValidation
+from app.models.job import ValidationJob
+from app.crud.job_crud import (
+    create_job_sync, finish_job_sync, requeue_chunks_sync, set_chunk_status_sync,
+    settle_chunk_sync, settle_cancelled_chunks_sync,
+    job_progress_sync, get_chunk, get_job_status, get_results_for_rows,
+    save_job_results, save_checkpoint,
+)
+from app.config import settings
+from app.logic.dedup import canonical_email
+from app.utils.email_reader import read_chunk
+from app.core.deadline import Deadline
+from app.core.worker_runtime import runtime
+from app.services.job_scheduler import dispatch_chunks, close_job_if_complete
+
+def run_with_session(func, *args, **kwargs):
+    """
+    Run an async validator on this worker's runtime (persistent loop,
+    caches and pools) with a pooled AsyncSession passed as `db`.
+    """
+    async def main():
+        async with runtime.session() as db:
+            return await func(*args, db=db, **kwargs)
+    return runtime.run(main())
+
 
 # -----------------------------
 # Single email validation
 # -----------------------------
 @shared_task(bind=True)
-def validate_single_email(self, email: str, user_id: int) -> dict:
+def validate_single_email(self, email: str, user_id: int, expires_at: float | None = None) -> dict:
     """
     Celery task to validate a single email.
-    Deducts 1 credit (sync) and runs async validation.
+    Reserves 1 credit (sync), runs async validation, refunds it on failure.
+    `expires_at` is the wall-clock deadline set by the route, if any.
     Returns result dict (not HTML).
     """
     db: Session = SessionLocal()
     try:
-        # 1️⃣ Fetch user & deduct credit
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"error": "User not found"}
-        if user.credits < 1:
+        # 1️⃣ Take the credit (one conditional UPDATE)
+        if reserve_credits_sync(db, user_id, 1, kind="charge") is None:
             return {"error": "Not enough credits"}
+        db.commit()
 
-        deduct_credit_sync(db, user_id, 1)
-
-        # 2️⃣ Run async validate_email inside event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(validate_email(email, db, user_id, deep=True))
-        loop.close()
-
-        return result
+        # 2️⃣ Run async validate_email on the worker's event loop (already charged above)
+        deadline = Deadline.at(expires_at) if expires_at else None
+        try:
+            return run_with_session(validate_email, email, user_id=user_id, deep=True,
+                                    deadline=deadline, charge=False)
+        except Exception:
+            release_credits_sync(db, user_id, 1)
+            db.commit()
+            raise
 
     finally:
         db.close()
@@ -49,56 +79,327 @@ def validate_single_email(self, email: str, user_id: int) -> dict:
 @celery_app.task(bind=True)
 def validate_multiple_emails(self, emails: list[str], user_id: int):
     db: Session = SessionLocal()
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        return {"error": "User not found"}
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return {"error": "User not found"}
+
+        # Duplicates/aliases of a mailbox are validated (and billed) once:
+        # reserve one credit per mailbox up front
+        unique = len({canonical_email(e) for e in emails})
+        if reserve_credits_sync(db, user_id, unique) is None:
+            return {"error": "Not enough credits"}
+        db.commit()
+
+        # Domain facts are computed once per domain, mailbox checks per address;
+        # nothing is billed per address, the reservation is settled afterwards
+        seen = {}
+        try:
+            results = runtime.run(validate_emails_by_domain(emails, runtime.session, user_id,
+                                                            deep=True, seen=seen, charge=False))
+        finally:
+            # Refund the mailboxes that weren't validated (e.g. on failure)
+            if unique > len(seen):
+                release_credits_sync(db, user_id, unique - len(seen))
+                db.commit()
+
+        return {
+            "validated": len(results),
+            "unique": len(seen),
+            "dedup_saved": len(results) - len(seen),
+            "remaining_credits": get_credits_sync(db, user_id),
+            "results": results
+        }
+    finally:
+        db.close()
+
+
+# -----------------------------
+# Chunked fan-out (bulk / batch)
+# -----------------------------
+def split_into_chunks(emails: list[str], chunk_size: int) -> list[list[tuple[int, str]]]:
+    """
+    Split rows into chunks of about `chunk_size` (row index, email) pairs.
+    Rows are grouped by domain, and all rows of one mailbox stay in the
+    same chunk, so each chunk reuses domain facts and dedups on its own.
+    """
+    groups = {}
+    for index, email in enumerate(emails):
+        groups.setdefault(canonical_email(email), []).append((index, email))
+
+    chunks, chunk = [], []
+    for key in sorted(groups, key=lambda k: (k.rpartition("@")[2], k)):
+        chunk.extend(groups[key])
+        if len(chunk) >= chunk_size:
+            chunks.append(chunk)
+            chunk = []
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _dispatch(db: Session) -> int:
+    """Queue the chunks the fair-share scheduler lets through now."""
+    picked = dispatch_chunks(db)
+    for job_id, chunk, user_id in picked:
+        validate_job_chunk.delay(job_id, chunk, user_id)
+    return len(picked)
 
-    if user.credits < len(emails):
-        return {"error": "Not enough credits"}
 
-    async def run_validations():
-        tasks = [validate_email(e, db, user_id, deep=True) for e in emails]
-        return await asyncio.gather(*tasks)
+def _settle(db: Session, job_id: str) -> ValidationJob | None:
+    """
+    Close the job if its last chunk just settled: roll the checkpoints up
+    and drop the spool once done. A failed job keeps its checkpoints,
+    stored rows and spool, so resume_job can pick it up later.
+    """
+    status = close_job_if_complete(db, job_id)
+    if status is None:
+        job = db.get(ValidationJob, job_id)
+        if job is not None and job.status == "cancelled":
+            # Chunks keep settling after a cancel: keep its totals current
+            finish_job_sync(db, job_id, status="cancelled")
+        return None
+    job = finish_job_sync(db, job_id, status=status)
+    if status == "done" and job.spool_path and os.path.exists(job.spool_path):
+        os.remove(job.spool_path)
+    return job
+
+
+def _fresh_job(db: Session, job_id: str) -> ValidationJob | None:
+    """The job row as committed now, not as cached in the session."""
+    return db.query(ValidationJob).populate_existing().filter(ValidationJob.id == job_id).first()
+
+
+def _publish_progress(db: Session, job_id: str) -> None:
+    """
+    Publish the job's progress as the state of the task that started it,
+    so /tasks/{task_id} shows it: PROGRESS while running, SUCCESS with the
+    summary once closed. Called at chunk boundaries only, never per address.
+
+    PROGRESS is only written for a running job, and the status is checked
+    again afterwards: if the last chunk closed the job meanwhile, SUCCESS
+    is written (again) so it is always the final state.
+    """
+    job = _fresh_job(db, job_id)
+    if job is None or not job.task_id:
+        return
+    if job.status == "running":
+        celery_app.backend.store_result(job.task_id, job_progress_sync(db, job_id), "PROGRESS")
+        job = _fresh_job(db, job_id)
+        if job.status == "running":
+            return
+    summary = _job_summary(job, get_credits_sync(db, job.user_id))
+    celery_app.backend.store_result(job.task_id, {**job_progress_sync(db, job_id), **summary}, "SUCCESS")
+
+
+def _stored_report(result) -> dict:
+    return {"email": result.email, "score": result.score, "status": result.status,
+            "category": result.status, "details": result.details}
+
+
+async def _validate_chunk(job_id: str, chunk_no: int, user_id: int) -> dict:
+    """
+    Validate one chunk of a job, resuming from its checkpoint.
+
+    Reports are written to job_results in batches of job_results_flush_rows,
+    each in one transaction with the chunk checkpoint (rows processed,
+    status counts, credits used). After a crash or retry, rows already
+    stored are skipped and their reports seed the dedup map, so they are
+    not validated or billed again; only the work since the last checkpoint
+    (at most one flush batch) is redone.
+
+    A cancelled job is noticed at the next checkpoint: the chunk stops there.
+    """
+    async with runtime.session() as db:
+        job, chunk = await get_chunk(db, job_id, chunk_no)
+        if chunk.status == "done":
+            return {"chunk": chunk_no, "rows": chunk.processed, "resumed": False}
+        if job.status == "cancelled":
+            await save_checkpoint(db, chunk.id, status="cancelled")
+            await db.commit()
+            return {"chunk": chunk_no, "rows": chunk.processed, "cancelled": True}
+        if chunk.emails is not None:
+            rows = [(row, email) for row, email in chunk.emails]
+        else:
+            rows = list(enumerate(read_chunk(job.spool_path, chunk.offset, chunk.rows),
+                                  start=chunk.first_row))
+        stored = await get_results_for_rows(db, job_id, [row for row, _ in rows])
+
+    seen = {canonical_email(r.email): _stored_report(r) for r in stored}
+    seeded = len(seen)
+    done_rows = {r.row for r in stored}
+    todo = [(row, email) for row, email in rows if row not in done_rows]
+
+    counts = dict(chunk.counts or {})
+    processed, credits_used = chunk.processed, chunk.credits_used
+    buffer = []
+
+    async def flush(final: bool = False) -> bool:
+        """Write the buffer and checkpoint; False if the job was cancelled meanwhile."""
+        nonlocal processed
+        processed += len(buffer)
+        async with runtime.session() as db:
+            cancelled = await get_job_status(db, job_id) == "cancelled"
+            await save_job_results(db, job_id, buffer)
+            await save_checkpoint(
+                db, chunk.id, processed=processed, counts=dict(counts), unique=len(seen),
+                credits_used=credits_used + len(seen) - seeded,
+                status="done" if final else "cancelled" if cancelled else "queued",
+            )
+            await db.commit()
+        buffer.clear()
+        return not cancelled
+
+    emails = [email for _, email in todo]
+    # Billed through the job's reservation (settled per chunk), not per address
+    reports = iter_validate_emails(emails, runtime.session, user_id, deep=True, seen=seen,
+                                   charge=False)
+    async with aclosing(reports):
+        async for index, report in reports:
+            counts[report["status"]] = counts.get(report["status"], 0) + 1
+            buffer.append((todo[index][0], report))
+            if len(buffer) >= settings.job_results_flush_rows and not await flush():
+                return {"chunk": chunk_no, "rows": processed, "cancelled": True}
+    await flush(final=True)
+
+    return {"chunk": chunk_no, "rows": processed, "resumed": bool(stored)}
+
+
+@celery_app.task(bind=True, acks_late=True, max_retries=settings.chunk_max_retries)
+def validate_job_chunk(self, job_id: str, chunk: int, user_id: int) -> dict:
+    """
+    Validate one chunk of a bulk/batch job. Chunks are independent tasks on
+    the bulk queue, released by the fair-share scheduler: a failed chunk is
+    retried alone, finished chunks are never redone, and a chunk cut short
+    resumes from its last checkpoint. The rows come from the job (spool
+    offset or stored emails), so the message carries only ids.
+    Each settled chunk refunds the credits it reserved but didn't use,
+    closes its job if it was the last one and lets the scheduler queue the
+    next chunks.
+    """
+    try:
+        result = runtime.run(_validate_chunk(job_id, chunk, user_id))
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+        result = None
+        failure = exc
+    db: Session = SessionLocal()
+    try:
+        if result is None:
+            set_chunk_status_sync(db, job_id, chunk, "failed")
+        settle_chunk_sync(db, job_id, chunk)
+        _settle(db, job_id)
+        _publish_progress(db, job_id)
+        _dispatch(db)
+    finally:
+        db.close()
+    if result is None:
+        raise failure
+    return result
 
-    results = asyncio.run(run_validations())
-    deduct_credit(db, user_id, len(emails))
 
+def _job_summary(job, remaining_credits: int) -> dict:
     return {
-        "validated": len(results),
-        "remaining_credits": user.credits,
-        "results": results
+        "job_id": job.id,
+        "status": job.status,
+        "validated": job.processed,
+        "unique": job.unique,
+        "dedup_saved": job.processed - job.unique,
+        "credits_used": job.credits_used,
+        "credits_reserved": job.credits_reserved,
+        "counts": job.counts,
+        "remaining_credits": remaining_credits,
     }
 
 
-# -----------------------------
-# Bulk email validation (file upload)
-# -----------------------------
 @celery_app.task(bind=True)
-def validate_bulk_emails(self, file_path: str, user_id: int):
+def resume_job(self, job_id: str):
+    """
+    Restart the unfinished chunks of a job (e.g. after it failed or its
+    workers died): they go back to the scheduler, finished ones are kept.
+    """
     db: Session = SessionLocal()
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        return {"error": "User not found"}
+    try:
+        job = db.get(ValidationJob, job_id)
+        if job is None:
+            return {"error": "Job not found"}
+        if not requeue_chunks_sync(db, job):
+            return {"error": "Not enough credits"}
+        job.status = "running"
+        job.finished_at = None
+        db.commit()
 
-    # Read emails from file
-    with open(file_path, "r") as f:
-        emails = [line.strip() for line in f if line.strip()]
+        # Nothing left to run: close it right away
+        job = _settle(db, job_id) or job
+        _publish_progress(db, job_id)
+        _dispatch(db)
+        return _job_summary(job, get_credits_sync(db, job.user_id))
+    finally:
+        db.close()
 
-    if user.credits < len(emails):
-        return {"error": "Not enough credits"}
 
-    async def run_validations():
-        tasks = [validate_email(e, db, user_id, deep=True) for e in emails]
-        return await asyncio.gather(*tasks)
+@celery_app.task(bind=True)
+def settle_job(self, job_id: str):
+    """
+    After a cancel: refund the chunks it dropped, roll the job up, publish
+    its final state and hand the bulk slots it held to other jobs.
+    """
+    db: Session = SessionLocal()
+    try:
+        settle_cancelled_chunks_sync(db, job_id)
+        _settle(db, job_id)
+        _publish_progress(db, job_id)
+        _dispatch(db)
+    finally:
+        db.close()
 
-    results = asyncio.run(run_validations())
-    deduct_credit(db, user_id, len(emails))
 
-    return {
-        "validated": len(results),
-        "remaining_credits": user.credits,
-        "results": results
-    }
+# -----------------------------
+# Bulk email validation (file upload)
+# -----------------------------
+@celery_app.task(bind=True)
+def validate_bulk_emails(self, spool_path: str, index: list, user_id: int):
+    """
+    Validate a TXT/CSV (optionally gzipped) file of any size.
+    The route has already streamed it into a spool of one address per line
+    (`index` holds each chunk's (offset, count)); chunk tasks read their own
+    slice of it, so no process holds the whole list.
+    Duplicates are merged within each chunk only.
+    """
+    db: Session = SessionLocal()
+    job = None
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return {"error": "User not found"}
+
+        total = sum(count for _, count in index)
+        if not total:
+            return {"error": "No emails found in file"}
+
+        # Row count is an upper bound on the credits a chunk can use: it is
+        # reserved with the job, and each chunk refunds what dedup saved
+        chunks, first_row = [], 0
+        for offset, count in index:
+            chunks.append({"first_row": first_row, "rows": count, "offset": offset,
+                           "credits_reserved": count})
+            first_row += count
+        job = create_job_sync(db, user_id, "bulk", total, chunks, spool_path=spool_path,
+                              task_id=self.request.id)
+        if job is None:
+            return {"error": "Not enough credits"}
+        # Chunks run in parallel on the bulk workers, as the scheduler releases
+        # them; they report progress under this task's id, and its final state
+        # is stored by the last one (results are paged from /jobs/{job_id})
+        _publish_progress(db, job.id)
+        _dispatch(db)
+    finally:
+        db.close()
+        # Once a job owns the spool, _settle removes it; until then it's ours
+        if job is None and os.path.exists(spool_path):
+            os.remove(spool_path)
+    raise Ignore()
 
 
 # -----------------------------
@@ -107,31 +408,62 @@ def validate_bulk_emails(self, file_path: str, user_id: int):
 @celery_app.task(bind=True)
 def validate_batch_emails(self, emails: list[str], user_id: int, batch_size: int = 50):
     """
-    Validates emails in batches to avoid memory overload.
+    Validates emails in chunks of `batch_size`, spread over the workers.
     """
     db: Session = SessionLocal()
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        return {"error": "User not found"}
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return {"error": "User not found"}
+
+        # Chunks keep mailboxes together, so each reserves exactly its mailbox count
+        chunks = [
+            {"first_row": min(row for row, _ in rows), "rows": len(rows), "emails": rows,
+             "credits_reserved": len({canonical_email(email) for _, email in rows})}
+            for rows in split_into_chunks(emails, batch_size)
+        ]
+        job = create_job_sync(db, user_id, "batch", len(emails), chunks, task_id=self.request.id)
+        if job is None:
+            return {"error": "Not enough credits"}
+        _publish_progress(db, job.id)
+        _dispatch(db)
+    finally:
+        db.close()
+    raise Ignore()
 
-    if user.credits < len(emails):
-        return {"error": "Not enough credits"}
 
-    all_results = []
+# -----------------------------
+# Greylist re-probe (scheduled by validate_email)
+# -----------------------------
+@celery_app.task(bind=True)
+def reprobe_greylisted(self, email: str, user_id: int, attempt: int = 1):
+    """
+    Re-probe an address whose RCPT was greylisted and update its stored
+    EmailValidation row once the server gives a real answer. Only a row
+    still pending is updated (locked, so a duplicate delivery sees it
+    settled): a revalidated address keeps its fresh verdict.
+    """
+    smtp_ok = runtime.run(check_smtp(email))
+    if smtp_ok == PENDING and attempt < settings.greylist_max_attempts:
+        schedule_greylist_reprobe(email, user_id, attempt + 1)
+        return {"email": email, "status": PENDING, "attempt": attempt}
 
-    async def run_batch(batch):
-        tasks = [validate_email(e, db, user_id, deep=True) for e in batch]
-        return await asyncio.gather(*tasks)
+    db: Session = SessionLocal()
+    try:
+        record = db.query(EmailValidation).filter(
+            EmailValidation.email == email, EmailValidation.user_id == user_id,
+            EmailValidation.status == PENDING,
+        ).with_for_update().first()
+        if not record:
+            return {"email": email, "skipped": "No pending validation record", "attempt": attempt}
 
-    # Process in batches
-    for i in range(0, len(emails), batch_size):
-        batch = emails[i:i + batch_size]
-        batch_results = asyncio.run(run_batch(batch))
-        all_results.extend(batch_results)
-        deduct_credit(db, user_id, len(batch))  # Deduct per batch
+        # The stored score excludes SMTP points while pending
+        record.smtp_ok = smtp_ok is True
+        if record.smtp_ok:
+            record.score += WEIGHTS["smtp"]
+        record.status = categorize_email(record.score)
+        db.commit()
 
-    return {
-        "validated": len(all_results),
-        "remaining_credits": user.credits,
-        "results": all_results
-    }
+        return {"email": email, "status": record.status, "score": record.score, "attempt": attempt}
+    finally:
+        db.close()
@@ -1,9 +1,35 @@
+from sqlalchemy import update, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 from fastapi import HTTPException
 
 from app.models.user import User
+from app.models.credit import CreditLedger
+
+
+# ---------- Statements ----------
+# A balance change is one UPDATE ... RETURNING (conditional on the balance
+# for debits) plus its ledger row, in the caller's transaction: no SELECT,
+# no refresh, and two concurrent debits can't both pass the check.
+
+def _adjust(user_id: int, amount: int, require_balance: bool):
+    stmt = update(User).where(User.id == user_id)
+    if require_balance and amount < 0:
+        stmt = stmt.where(User.credits >= -amount)
+    return stmt.values(credits=User.credits + amount).returning(User.credits)
+
+
+def _ledger(user_id: int, amount: int, balance: int, kind: str, job_id: str | None):
+    return insert(CreditLedger).values(
+        user_id=user_id, job_id=job_id, kind=kind, amount=amount, balance=balance
+    )
+
+
+def _not_enough(user_exists: bool) -> HTTPException:
+    if not user_exists:
+        return HTTPException(status_code=404, detail="User not found")
+    return HTTPException(status_code=400, detail="Not enough credits")
 
 
 # ---------- Async Utilities ----------
@@ -13,32 +39,25 @@ async def deduct_credit(db: AsyncSession, user_id: int, amount: int = 1) -> None
     Deduct credits from a user (async version).
     Raises HTTPException if user not found or insufficient credits.
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalars().first()
+    balance = (await db.execute(_adjust(user_id, -amount, require_balance=True))).scalar()
+    if balance is None:
+        user = (await db.execute(select(User.id).where(User.id == user_id))).first()
+        raise _not_enough(user is not None)
 
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if user.credits < amount:
-        raise HTTPException(status_code=400, detail="Not enough credits")
-
-    user.credits -= amount
+    await db.execute(_ledger(user_id, -amount, balance, "charge", None))
     await db.commit()
-    await db.refresh(user)
 
 
 async def add_credit(db: AsyncSession, user_id: int, amount: int = 1) -> None:
     """
     Add credits to a user (async version).
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalars().first()
-
-    if not user:
+    balance = (await db.execute(_adjust(user_id, amount, require_balance=False))).scalar()
+    if balance is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.credits += amount
+    await db.execute(_ledger(user_id, amount, balance, "credit", None))
     await db.commit()
-    await db.refresh(user)
 
 
 async def get_credits(db: AsyncSession, user_id: int) -> int:
@@ -60,30 +79,22 @@ def deduct_credit_sync(db: Session, user_id: int, amount: int = 1) -> None:
     """
     Deduct credits from a user (sync version).
     """
-    user = db.query(User).filter(User.id == user_id).first()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if user.credits < amount:
-        raise HTTPException(status_code=400, detail="Not enough credits")
-
-    user.credits -= amount
+    if reserve_credits_sync(db, user_id, amount, kind="charge") is None:
+        user = db.execute(select(User.id).where(User.id == user_id)).first()
+        raise _not_enough(user is not None)
     db.commit()
-    db.refresh(user)
 
 
 def add_credit_sync(db: Session, user_id: int, amount: int = 1) -> None:
     """
     Add credits to a user (sync version).
     """
-    user = db.query(User).filter(User.id == user_id).first()
-
-    if not user:
+    balance = db.execute(_adjust(user_id, amount, require_balance=False)).scalar()
+    if balance is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.credits += amount
+    db.execute(_ledger(user_id, amount, balance, "credit", None))
     db.commit()
-    db.refresh(user)
 
 
 def get_credits_sync(db: Session, user_id: int) -> int:
@@ -96,3 +107,35 @@ def get_credits_sync(db: Session, user_id: int) -> int:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user.credits
+
+
+# ---------- Reservations (bulk/batch jobs) ----------
+
+def reserve_credits_sync(db: Session, user_id: int, amount: int, job_id: str | None = None,
+                         kind: str = "reserve") -> int | None:
+    """
+    Take `amount` credits up front in one conditional UPDATE ... RETURNING.
+    Returns the new balance, or None (nothing taken) if the balance is too
+    low or the user doesn't exist. Not committed: the caller commits it with
+    the work it pays for.
+    """
+    balance = db.execute(_adjust(user_id, -amount, require_balance=True)).scalar()
+    if balance is None:
+        return None
+    db.execute(_ledger(user_id, -amount, balance, kind, job_id))
+    return balance
+
+
+def release_credits_sync(db: Session, user_id: int, amount: int,
+                         job_id: str | None = None) -> int | None:
+    """
+    Settle a reservation: give back `amount` unused credits, or take
+    -`amount` more if more were used than reserved (never refused, the work
+    is done). None (nothing to settle) if the user no longer exists.
+    Not committed.
+    """
+    balance = db.execute(_adjust(user_id, amount, require_balance=False)).scalar()
+    if balance is None:
+        return None
+    db.execute(_ledger(user_id, amount, balance, "refund" if amount > 0 else "charge", job_id))
+    return balance
@@ -0,0 +1,90 @@
+# app/utils/email_reader.py
+import csv
+import gzip
+import io
+import os
+import tempfile
+from itertools import islice
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _open_text(fileobj, filename: str = "") -> io.TextIOBase:
+    """Text view of a binary upload; gzip is detected by magic bytes or the .gz suffix."""
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    if head == GZIP_MAGIC or filename.endswith(".gz"):
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode="rb")
+    return io.TextIOWrapper(fileobj, encoding="utf-8", errors="replace", newline="")
+
+
+def iter_emails(fileobj, filename: str = ""):
+    """
+    Yield addresses from a TXT or CSV file (optionally gzipped), one line
+    at a time, so memory doesn't grow with the file. CSV uses the first column.
+    """
+    text = _open_text(fileobj, filename)
+    is_csv = filename.removesuffix(".gz").endswith(".csv")
+    rows = (row[0] if row else "" for row in csv.reader(text)) if is_csv else text
+    for value in rows:
+        value = value.strip()
+        if value:
+            yield value
+
+
+def iter_chunks(iterable, size: int):
+    """Yield lists of at most `size` items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def spool_emails(fileobj, filename: str, dst_path: str, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Stream the addresses of an upload into `dst_path`, one per line, and
+    return the chunk index: (byte offset, row count) every `chunk_size` rows.
+    Chunks can then be read back independently with read_chunk().
+    """
+    index = []
+    with open(dst_path, "wb") as dst:
+        for chunk in iter_chunks(iter_emails(fileobj, filename), chunk_size):
+            index.append((dst.tell(), len(chunk)))
+            dst.write("".join(f"{email}\n" for email in chunk).encode("utf-8"))
+    return index
+
+
+def read_chunk(path: str, offset: int, count: int) -> list[str]:
+    """Read back one chunk of a file written by spool_emails()."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return [line.decode("utf-8").rstrip("\n") for line in islice(f, count)]
+
+
+def new_spool_path() -> str:
+    """Fresh file under `upload_dir` (must be shared with the workers)."""
+    if settings.upload_dir:
+        os.makedirs(settings.upload_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".emails", dir=settings.upload_dir or None)
+    os.close(fd)
+    return path
+
+
+async def spool_upload(upload, chunk_size: int) -> tuple[str, list[tuple[int, int]]]:
+    """spool_emails() for a FastAPI UploadFile, off the event loop."""
+    path = new_spool_path()
+    index = await run_in_threadpool(spool_emails, upload.file, upload.filename or "", path, chunk_size)
+    return path, index
+
+
+async def aiter_spooled(path: str, index: list[tuple[int, int]]):
+    """
+    Async iterator over the chunks of a spooled file. The next chunk is
+    only read once the consumer asks for it, so a slow validator holds
+    one chunk in memory, not the file.
+    """
+    for offset, count in index:
+        yield await run_in_threadpool(read_chunk, path, offset, count)
@@ -1,5 +1,5 @@
 import re
-import dns.resolver
+from app.core.dns_resolver import resolver
 
 def generate_email_patterns(name: str, company: str):
     if not name or not company:
@@ -37,7 +37,6 @@ def verify_email(email: str) -> bool:
 
     try:
         domain = email.split("@")[1]
-        dns.resolver.resolve(domain, "MX")
-        return True
+        return bool(resolver.resolve_sync(domain, "MX"))
     except Exception:
         return False
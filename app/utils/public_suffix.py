@@ -0,0 +1,66 @@
+# app/utils/public_suffix.py
+from functools import lru_cache
+from pathlib import Path
+
+# Bundled copy of https://publicsuffix.org/list/public_suffix_list.dat
+PSL_PATH = Path(__file__).resolve().parent.parent / "data" / "public_suffix_list.dat"
+
+
+@lru_cache(maxsize=1)
+def _load_rules() -> tuple[frozenset, frozenset, frozenset]:
+    """
+    Parse the ICANN section of the list into (rules, wildcards, exceptions).
+    Private-section suffixes (e.g. blogspot.com) are skipped on purpose:
+    WHOIS registrations live at the ICANN level.
+    """
+    rules, wildcards, exceptions = set(), set(), set()
+    with open(PSL_PATH, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("// ===END ICANN DOMAINS==="):
+                break
+            if not line or line.startswith("//"):
+                continue
+            rule = line.split()[0].lower()
+            if not rule.isascii():
+                # Email domains arrive punycoded (xn--...)
+                try:
+                    rule = rule.encode("idna").decode("ascii")
+                except UnicodeError:
+                    continue
+            if rule.startswith("!"):
+                exceptions.add(rule[1:])
+            elif rule.startswith("*."):
+                wildcards.add(rule[2:])
+            else:
+                rules.add(rule)
+    return frozenset(rules), frozenset(wildcards), frozenset(exceptions)
+
+
+def public_suffix(domain: str) -> str:
+    """Longest public suffix of `domain` (falls back to its last label)."""
+    rules, wildcards, exceptions = _load_rules()
+    labels = domain.lower().rstrip(".").split(".")
+    for i in range(len(labels)):
+        candidate = ".".join(labels[i:])
+        if candidate in exceptions:
+            return ".".join(labels[i + 1:])
+        if candidate in rules:
+            return candidate
+        if i + 1 < len(labels) and ".".join(labels[i + 1:]) in wildcards:
+            return candidate
+    return labels[-1]
+
+
+def registrable_domain(domain: str) -> str:
+    """
+    Registrable domain (public suffix + one label), e.g.
+    mail.eu.example.co.uk -> example.co.uk. Returns the input if it is
+    itself a public suffix.
+    """
+    domain = domain.lower().rstrip(".")
+    suffix = public_suffix(domain)
+    if domain == suffix:
+        return domain
+    head = domain[: -len(suffix) - 1]
+    return f"{head.rsplit('.', 1)[-1]}.{suffix}"
@@ -0,0 +1,63 @@
+"""
+Micro-benchmark for app/logic/domain_lists.DomainList.
+
+Builds a synthetic list of N domains and times M suffix lookups
+(a mix of hits, subdomain hits and misses).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_domain_lists --domains 200000 --lookups 2000000
+"""
+import argparse
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.logic.domain_lists import DomainList
+
+
+def _random_domain(rng: random.Random) -> str:
+    name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14)))
+    return f"{name}.{rng.choice(['com', 'net', 'org', 'io', 'co.uk', 'de'])}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--domains", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    domains = [_random_domain(rng) for _ in range(args.domains)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "bench_domains.txt").write_text("\n".join(domains))
+        settings.domain_lists_dir = tmp
+
+        started = time.perf_counter()
+        domain_list = DomainList("bench_domains.txt")
+        load_s = time.perf_counter() - started
+
+        queries = []
+        for _ in range(args.lookups):
+            kind = rng.random()
+            if kind < 0.3:
+                queries.append(rng.choice(domains))
+            elif kind < 0.5:
+                queries.append(f"mail.eu.{rng.choice(domains)}")
+            else:
+                queries.append(_random_domain(rng))
+
+        started = time.perf_counter()
+        hits = sum(1 for q in queries if q in domain_list)
+        lookup_s = time.perf_counter() - started
+
+    print(f"entries:  {len(domain_list):,} (loaded in {load_s * 1000:.0f} ms)")
+    print(f"lookups:  {args.lookups:,} in {lookup_s:.2f} s "
+          f"({lookup_s / args.lookups * 1e9:.0f} ns/lookup, {hits:,} hits)")
+
+
+if __name__ == "__main__":
+    main()